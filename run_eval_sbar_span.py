@@ -2,7 +2,12 @@ import argparse
 
 from config.dspy_settings import configure_dspy
 from config.model_registry import load_model
-from data.dataset import prepare_dataset_sbar_span, prepare_dataset_sbar_span_all
+from data.dataset import (
+    prepare_dataset_sbar_span,
+    prepare_dataset_sbar_span_all,
+    prepare_dataset_sbar_span_arrow,
+    prepare_dataset_sbar_span_arrow_all,
+)
 from eval.evaluator import evaluate_sbar
 from sbar_span_task.signatures import build_predictor
 
@@ -26,6 +31,15 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Evaluate on all matching examples (no train/test split).",
     )
+    parser.add_argument(
+        "--use-arrow-cache",
+        action="store_true",
+        help=(
+            "Load data via a memory-mapped Feather sidecar (built on first "
+            "use, rebuilt when the JSONL changes). Requires pyarrow. "
+            "Implied when --data-file ends with .feather."
+        ),
+    )
     parser.add_argument(
         "--output-model-file",
         default=None,
@@ -81,21 +95,25 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--timing-log",
         action="store_true",
-        help="Print detailed per-example timing breakdowns.",
+        help=(
+            "Record per-example timing rows to "
+            "<eval-results-file>.timings.ndjson and print a post-hoc summary "
+            "of the slowest examples."
+        ),
     )
     parser.add_argument(
         "--timing-log-every",
         type=int,
         default=1,
-        help="Emit timing logs every N examples (default: 1).",
+        help="Record a timing row every N examples (default: 1).",
     )
     parser.add_argument(
         "--timing-slow-threshold-seconds",
         type=float,
         default=None,
         help=(
-            "Always emit timing logs when an example takes at least this many seconds; "
-            "disabled when omitted."
+            "Always record a timing row when an example takes at least this "
+            "many seconds; disabled when omitted."
         ),
     )
     args = parser.parse_args()
@@ -109,12 +127,17 @@ def parse_args() -> argparse.Namespace:
 
 
 args = parse_args()
+use_arrow = args.use_arrow_cache or args.data_file.endswith(".feather")
 if args.use_all:
-    testset = prepare_dataset_sbar_span_all(
-        args.data_file, annotator_id=args.annotator_id
+    prepare_all = (
+        prepare_dataset_sbar_span_arrow_all if use_arrow else prepare_dataset_sbar_span_all
     )
+    testset = prepare_all(args.data_file, annotator_id=args.annotator_id)
 else:
-    _, testset = prepare_dataset_sbar_span(args.data_file, annotator_id=args.annotator_id)
+    prepare_split = (
+        prepare_dataset_sbar_span_arrow if use_arrow else prepare_dataset_sbar_span
+    )
+    _, testset = prepare_split(args.data_file, annotator_id=args.annotator_id)
 eval_results_file = args.eval_results_file
 
 predictor = build_predictor()
@@ -93,6 +93,23 @@ def parse_args() -> argparse.Namespace:
         default=1.5,
         help="Delay between retries on extraction API errors.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of eval records extracted in flight at once.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Eval records grouped into one composite extraction prompt.",
+    )
+    parser.add_argument(
+        "--cache-responses",
+        action="store_true",
+        help="Cache extraction responses on disk and reuse them across runs.",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -181,6 +198,9 @@ summary = run_langextract_sbar_experiment(
     lm_max_output_tokens=args.lm_max_output_tokens,
     max_retries=args.max_retries,
     retry_delay_seconds=args.retry_delay_seconds,
+    concurrency=args.concurrency,
+    batch_size=args.batch_size,
+    cache_responses=args.cache_responses,
     api_key=api_key,
     fence_output=args.fence_output,
     use_schema_constraints=args.use_schema_constraints,
@@ -4,6 +4,7 @@ import json
 from config.dspy_settings import configure_dspy
 from config.model_registry import load_model
 from data.dataset import prepare_dataset_sbar_span
+from eval.evaluator import predict_with_retries
 from sbar_span_task.signatures import build_predictor
 
 DEFAULT_DATA_FILE = "./annotated_data/db_20260129_tokenised_consensus.jsonl"
@@ -32,6 +33,18 @@ def parse_args() -> argparse.Namespace:
         default="consensus",
         help="Annotator filter used when constructing the deterministic split.",
     )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Maximum prediction attempts before giving up.",
+    )
+    parser.add_argument(
+        "--retry-delay-seconds",
+        type=float,
+        default=1.0,
+        help="Base backoff delay between retries.",
+    )
     return parser.parse_args()
 
 
@@ -50,7 +63,12 @@ def main() -> None:
     predictor = build_predictor()
     predictor.load(args.output_model_file)
 
-    prediction = predictor(text=example.text)
+    prediction = predict_with_retries(
+        predictor,
+        {"text": example.text},
+        max_retries=args.max_retries,
+        retry_delay_seconds=args.retry_delay_seconds,
+    )
     print("Prediction:")
     print(prediction)
 
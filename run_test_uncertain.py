@@ -5,7 +5,7 @@ import dspy
 from config.dspy_settings import configure_dspy
 from config.settings import DATA_FILE, EVAL_RESULTS_FILE, OUTPUT_MODEL_FILE
 from data.dataset import prepare_dataset
-from eval.evaluator import evaluate
+from eval.evaluator import evaluate, predict_with_retries
 from uncertain_span_task.signatures import build_predictor
 
 lm = dspy.LM(model="openai/gpt-5-nano")
@@ -24,6 +24,18 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Filter examples by _annotator_id (e.g. handover_db-user1).",
     )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Maximum prediction attempts before giving up.",
+    )
+    parser.add_argument(
+        "--retry-delay-seconds",
+        type=float,
+        default=1.0,
+        help="Base backoff delay between retries.",
+    )
     return parser.parse_args()
 
 
@@ -33,4 +45,11 @@ _, testset = prepare_dataset(args.data_file, annotator_id=args.annotator_id)
 predictor = build_predictor()
 case = testset[17]
 print(f"text: {case.text}")
-print(predictor(text=case.text))
+print(
+    predict_with_retries(
+        predictor,
+        {"text": case.text},
+        max_retries=args.max_retries,
+        retry_delay_seconds=args.retry_delay_seconds,
+    )
+)
@@ -1,9 +1,5 @@
 import argparse
 
-from data.dataset import prepare_dataset
-from training.run_logging import enable_local_training_file_logging
-from training.trainer import train
-
 DATA_FILE = "./annotated_data/db_20260129_tokenised.jsonl"
 
 
@@ -51,28 +47,49 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-args = parse_args()
-enable_local_training_file_logging(__file__)
-trainset, valset = prepare_dataset(args.data_file, annotator_id=args.annotator_id)
-output_model_file = args.output_model_file
-if args.reasoning_effort is not None:
-    print(f"Reasoning effort override enabled: {args.reasoning_effort}.")
+def main() -> None:
+    args = parse_args()
+
+    # Heavy imports are deferred until after CLI parsing so --help and
+    # argument errors return instantly instead of paying the dspy import cost.
+    from config.model_registry import MODEL_REGISTRY
+    from config.optimiser_registry import OPTIM_REGISTRY
+    from data.dataset import prepare_dataset
+    from training.run_logging import enable_local_training_file_logging
+    from training.trainer import train
+
+    enable_local_training_file_logging(__file__)
+
+    # Fail fast on bad CLI args before paying for JSONL parsing.
+    if args.model_name not in MODEL_REGISTRY:
+        raise ValueError(f"Unknown model: {args.model_name}")
+    if args.optimiser_name not in OPTIM_REGISTRY:
+        raise ValueError(f"Unknown optimiser: {args.optimiser_name}")
+
+    trainset, valset = prepare_dataset(args.data_file, annotator_id=args.annotator_id)
+    output_model_file = args.output_model_file
+    if args.reasoning_effort is not None:
+        print(f"Reasoning effort override enabled: {args.reasoning_effort}.")
+
+    predictor = train(
+        args.model_name,
+        args.optimiser_name,
+        trainset,
+        valset,
+        gepa_log_dir=args.gepa_log_dir,
+        reasoning_effort=args.reasoning_effort,
+    )
+    predictor.save(output_model_file)
+    for name, pred in predictor.named_predictors():
+        print("================================")
+        print(f"Predictor: {name}")
+        print("================================")
+        print("Prompt:")
+        print(pred.signature.instructions)
+        print("*********************************")
+
+    print("Training complete. Saved to", output_model_file)
 
-predictor = train(
-    args.model_name,
-    args.optimiser_name,
-    trainset,
-    valset,
-    gepa_log_dir=args.gepa_log_dir,
-    reasoning_effort=args.reasoning_effort,
-)
-predictor.save(output_model_file)
-for name, pred in predictor.named_predictors():
-    print("================================")
-    print(f"Predictor: {name}")
-    print("================================")
-    print("Prompt:")
-    print(pred.signature.instructions)
-    print("*********************************")
 
-print("Training complete. Saved to", output_model_file)
+if __name__ == "__main__":
+    main()
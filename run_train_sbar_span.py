@@ -1,12 +1,5 @@
 import argparse
 
-from config.dspy_settings import configure_dspy
-from config.model_registry import load_model
-from config.optimiser_registry import OPTIM_REGISTRY, load_optimiser
-from data.dataset import prepare_dataset_sbar_span
-from sbar_span_task.signatures import build_predictor
-from training.run_logging import enable_local_training_file_logging
-
 DATA_FILE = "./annotated_data/db_20260129_tokenised.jsonl"
 
 
@@ -54,33 +47,47 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-args = parse_args()
-enable_local_training_file_logging(__file__)
-allowed_span_optimisers = {name for name in OPTIM_REGISTRY if name == "none" or name.endswith("_span")}
-if args.optimiser_name not in allowed_span_optimisers:
-    raise ValueError(
-        "Unsupported optimiser for SBAR span. "
-        "Use a span optimiser like 'gepa_light_span' or 'gepa_heavy_span'."
+def main() -> None:
+    args = parse_args()
+
+    # Heavy imports are deferred until after CLI parsing so --help and
+    # argument errors return instantly instead of paying the dspy import cost.
+    from config.dspy_settings import configure_dspy
+    from config.model_registry import load_model
+    from config.optimiser_registry import SPAN_OPTIMISERS, load_optimiser
+    from data.dataset import prepare_dataset_sbar_span
+    from sbar_span_task.signatures import build_predictor
+    from training.run_logging import enable_local_training_file_logging
+
+    enable_local_training_file_logging(__file__)
+    if args.optimiser_name not in SPAN_OPTIMISERS:
+        raise ValueError(
+            "Unsupported optimiser for SBAR span. "
+            "Use a span optimiser like 'gepa_light_span' or 'gepa_heavy_span'."
+        )
+
+    trainset, valset = prepare_dataset_sbar_span(
+        args.data_file, annotator_id=args.annotator_id
     )
+    output_model_file = args.output_model_file
+
+    if args.reasoning_effort is not None:
+        print(f"Reasoning effort override enabled: {args.reasoning_effort}.")
+    lm = load_model(args.model_name, reasoning_effort=args.reasoning_effort)
+    configure_dspy(lm)
 
-trainset, valset = prepare_dataset_sbar_span(
-    args.data_file, annotator_id=args.annotator_id
-)
-output_model_file = args.output_model_file
+    predictor = build_predictor()
+    optimiser_fn = load_optimiser(args.optimiser_name)
+    predictor = optimiser_fn(
+        predictor,
+        trainset,
+        valset,
+        gepa_log_dir=args.gepa_log_dir,
+    )
 
-if args.reasoning_effort is not None:
-    print(f"Reasoning effort override enabled: {args.reasoning_effort}.")
-lm = load_model(args.model_name, reasoning_effort=args.reasoning_effort)
-configure_dspy(lm)
+    predictor.save(output_model_file)
+    print("Training complete. Saved to", output_model_file)
 
-predictor = build_predictor()
-optimiser_fn = load_optimiser(args.optimiser_name)
-predictor = optimiser_fn(
-    predictor,
-    trainset,
-    valset,
-    gepa_log_dir=args.gepa_log_dir,
-)
 
-predictor.save(output_model_file)
-print("Training complete. Saved to", output_model_file)
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-from typing import Literal
+from functools import lru_cache
+from typing import Iterable, Literal
 
 LabelType = Literal[
     "introduction_clinicians",
@@ -65,12 +66,74 @@ LABEL_DESCRIPTIONS: dict[LabelType, str] = {
 }
 
 
+# Canonical (label, description) layout: tuple iteration is cheaper than a
+# dict items view on hot paths, and the index order defines the bit
+# positions in LABEL_BITS.
+LABEL_ITEMS: tuple[tuple[LabelType, str], ...] = tuple(LABEL_DESCRIPTIONS.items())
+
+LABEL_BITS: dict[str, int] = {
+    name: 1 << i for i, (name, _) in enumerate(LABEL_ITEMS)
+}
+
+
+def pack_labels(
+    labels: Iterable[str] | None, oov_bits: dict[str, int] | None = None
+) -> int:
+    """
+    Encode a label collection as a bitmask over the label universe.
+
+    Metrics compute tp/fp/fn via int.bit_count() on the packed masks, which
+    replaces per-example set-hash traversals with a few CPU ops.
+    Out-of-vocabulary labels (e.g. hallucinated by the model) are assigned
+    fresh bits above the vocabulary so false positives are counted exactly
+    as the set-based arithmetic would. Those bits come from oov_bits, which
+    a caller comparing two masks must share between both pack_labels calls;
+    LABEL_BITS itself is never mutated, so concurrent metric threads cannot
+    alias two different labels onto one bit.
+    """
+    bits = 0
+    table = LABEL_BITS
+    if oov_bits is None:
+        oov_bits = {}
+    for label in labels or ():
+        bit = table.get(label)
+        if bit is None:
+            bit = oov_bits.get(label)
+            if bit is None:
+                bit = 1 << (len(table) + len(oov_bits))
+                oov_bits[label] = bit
+        bits |= bit
+    return bits
+
+
+def f1_packed(gold: int, got: int) -> float:
+    """
+    F1 on packed label bitmasks (see pack_labels); both-empty is perfect.
+
+    This is the single metric kernel shared by metric_miprov and metric_gepa:
+    a handful of branchless int ops (bit_count compiles to POPCNT), so the
+    per-call cost is dominated by interpreter dispatch, not the arithmetic.
+    """
+    if not gold and not got:
+        return 1.0
+
+    tp = (gold & got).bit_count()
+    if tp == 0:
+        return 0.0
+
+    # tp > 0 implies every denominator below is positive.
+    p = tp / (tp + (got & ~gold).bit_count())
+    r = tp / (tp + (gold & ~got).bit_count())
+    return 2 * p * r / (p + r)
+
+
+_LABEL_DESC_HEADER = "Choose zero or more labels and return a Python list.\n\nAvailable labels:\n"
+
+
+@lru_cache(maxsize=1)
 def build_label_desc():
-    lines = [
-        "Choose zero or more labels and return a Python list.",
-        "",
-        "Available labels:",
-    ]
-    for k, v in LABEL_DESCRIPTIONS.items():
-        lines.append(f"- {k}: {v}")
-    return "\n".join(lines)
+    # The output is fully static, so build it once; GEPA/MIPRO reconstruct
+    # predictors many times and would otherwise redo this join per rebuild.
+    return _LABEL_DESC_HEADER + "\n".join(
+        f"- {k}: {v}" for k, v in LABEL_ITEMS
+    )
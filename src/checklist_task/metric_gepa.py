@@ -1,5 +1,21 @@
 import dspy
 
+from checklist_task.labels import LABEL_DESCRIPTIONS, f1_packed, pack_labels
+
+_LABEL_ORDER = tuple(LABEL_DESCRIPTIONS)
+
+
+def _ordered_join(labels: set) -> str:
+    """
+    Join a label subset in canonical checklist order with one O(|LABELS|)
+    pass instead of sorting each subset. Out-of-vocabulary labels (possible
+    in predictions) are appended alphabetically at the end.
+    """
+    ordered = [label for label in _LABEL_ORDER if label in labels]
+    if len(ordered) != len(labels):
+        ordered.extend(sorted(labels.difference(_LABEL_ORDER)))
+    return ", ".join(ordered)
+
 
 def _extract_labels(obj):
     if hasattr(obj, "toDict"):
@@ -27,11 +43,32 @@ def _extract_labels(obj):
     return []
 
 
+def _compute_f1(gold_labels, pred_labels) -> float:
+    """F1 over label collections; both empty counts as a perfect prediction."""
+    # Settle empty-label rows without packing anything.
+    if not gold_labels or not pred_labels:
+        return 1.0 if not gold_labels and not pred_labels else 0.0
+    # Shared across the two masks so an out-of-vocabulary label packs to
+    # the same bit on both sides.
+    oov_bits: dict[str, int] = {}
+    return f1_packed(
+        pack_labels(gold_labels, oov_bits), pack_labels(pred_labels, oov_bits)
+    )
+
+
 def feedback_multilabel(gold_labels, pred_labels):
     """
     gold_labels, pred_labels: list of strings (labels)
     Returns: (feedback_text, score_float)
     """
+    # Edge case: no labels at all -- answered before any sets are built.
+    if not gold_labels and not pred_labels:
+        fb_text = (
+            "The category classification is perfect. "
+            "You correctly identified that the text does not fall under any category."
+        )
+        return fb_text, 1.0
+
     gold = set(gold_labels or [])
     got = set(pred_labels or [])
 
@@ -39,69 +76,59 @@ def feedback_multilabel(gold_labels, pred_labels):
     incorrectly_included = got - gold
     incorrectly_excluded = gold - got
 
-    # Edge case: no labels at all
-    if not gold and not got:
-        score = 1.0
-        fb_text = (
-            "The category classification is perfect. "
-            "You correctly identified that the text does not fall under any category."
-        )
-        return fb_text, score
-
-    tp = len(correctly_included)
-    fp = len(incorrectly_included)
-    fn = len(incorrectly_excluded)
+    score = _compute_f1(gold, got)
 
-    if tp == 0:
-        score = 0.0
-        fb_text = (
+    parts = []
+    if not correctly_included:
+        parts.append(
             "The category classification is not perfect. "
             "None of the correctly applicable categories were identified."
         )
         if incorrectly_included:
-            fb_text += (
+            parts.append(
                 f" You incorrectly identified the following categories: "
-                f"`{', '.join(sorted(incorrectly_included))}`. "
+                f"`{_ordered_join(incorrectly_included)}`. "
                 "The message does NOT fall under these categories."
             )
         if incorrectly_excluded:
-            fb_text += (
+            parts.append(
                 f" You also missed the following categories that actually apply: "
-                f"`{', '.join(sorted(incorrectly_excluded))}`."
+                f"`{_ordered_join(incorrectly_excluded)}`."
             )
-        fb_text += " Think about how you could have reasoned to get the correct category labels."
-        return fb_text, score
-
-    p = tp / (tp + fp) if (tp + fp) else 0.0
-    r = tp / (tp + fn) if (tp + fn) else 0.0
-    score = 2 * p * r / (p + r) if (p + r) else 0.0  # F1
+        parts.append(
+            " Think about how you could have reasoned to get the correct category labels."
+        )
+        return "".join(parts), score
 
     if score == 1.0:
         fb_text = (
             "The category classification is perfect. You correctly identified that the text "
-            f"falls under the following categories: `{', '.join(sorted(gold))}`."
+            f"falls under the following categories: `{_ordered_join(gold)}`."
         )
-    else:
-        fb_text = (
-            "The category classification is not perfect. "
-            "You correctly identified that the message falls under the following categories: "
-            f"`{', '.join(sorted(correctly_included))}`.\n"
+        return fb_text, score
+
+    parts.append(
+        "The category classification is not perfect. "
+        "You correctly identified that the message falls under the following categories: "
+        f"`{_ordered_join(correctly_included)}`.\n"
+    )
+    if incorrectly_included:
+        parts.append(
+            "However, you incorrectly identified that the message falls under the "
+            f"following categories: `{_ordered_join(incorrectly_included)}`. "
+            "The message DOES NOT fall under these categories.\n"
         )
-        if incorrectly_included:
-            fb_text += (
-                "However, you incorrectly identified that the message falls under the "
-                f"following categories: `{', '.join(sorted(incorrectly_included))}`. "
-                "The message DOES NOT fall under these categories.\n"
-            )
-        if incorrectly_excluded:
-            prefix = "Additionally, " if incorrectly_included else "However, "
-            fb_text += (
-                f"{prefix}you didn't identify the following categories that the message actually "
-                f"falls under: `{', '.join(sorted(incorrectly_excluded))}`.\n"
-            )
-        fb_text += "Think about how you could have reasoned to get the correct category labels."
+    if incorrectly_excluded:
+        prefix = "Additionally, " if incorrectly_included else "However, "
+        parts.append(
+            f"{prefix}you didn't identify the following categories that the message actually "
+            f"falls under: `{_ordered_join(incorrectly_excluded)}`.\n"
+        )
+    parts.append(
+        "Think about how you could have reasoned to get the correct category labels."
+    )
 
-    return fb_text, score
+    return "".join(parts), score
 
 
 def multilabel_f1_with_feedback(
@@ -116,12 +143,12 @@ def multilabel_f1_with_feedback(
     gold_labels = _extract_labels(example)
     pred_labels = _extract_labels(pred)
 
-    fb_text, score = feedback_multilabel(gold_labels, pred_labels)
-
     # GEPA uses this function in two modes:
     # 1) scoring: pred_name is None -> return numeric score
     # 2) feedback for a specific module: pred_name is e.g. "classifier.predict"
+    # The scoring pass is the hot path, so skip feedback-string assembly there.
     if pred_name is None:
-        return score
+        return _compute_f1(gold_labels, pred_labels)
 
+    fb_text, score = feedback_multilabel(gold_labels, pred_labels)
     return dspy.Prediction(score=score, feedback=fb_text)
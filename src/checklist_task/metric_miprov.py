@@ -1,24 +1,34 @@
-def get_labels(x):
-    if hasattr(x, "toDict"):
-        x = x.toDict()
-    return set((x or {}).get("labels", []) or [])
+from checklist_task.labels import f1_packed, pack_labels
 
 
-def multilabel_f1(example, pred, trace=None):
-    gold = get_labels(example)
-    got = get_labels(pred)
+# Whether a type exposes toDict is type-stable across a trainset, so resolve
+# the hasattr probe once per type instead of per call; subsequent calls cost
+# one dict lookup on the type object.
+_HAS_TODICT: dict[type, bool] = {}
+
+
+def _raw_labels(x):
+    tp = type(x)
+    has_todict = _HAS_TODICT.get(tp)
+    if has_todict is None:
+        has_todict = _HAS_TODICT[tp] = hasattr(x, "toDict")
+    if has_todict:
+        x = x.toDict()
+    return (x or {}).get("labels") or ()
 
-    if not gold and not got:
-        return 1.0
 
-    tp = len(gold & got)
-    fp = len(got - gold)
-    fn = len(gold - got)
 
-    if tp == 0:
-        return 0.0
+def multilabel_f1(example, pred, trace=None):
+    gold = _raw_labels(example)
+    got = _raw_labels(pred)
 
-    p = tp / (tp + fp) if (tp + fp) else 0
-    r = tp / (tp + fn) if (tp + fn) else 0
+    # Zero-label rows are common model output; settle them on the raw lists
+    # before paying for set/bitmask construction.
+    if not gold or not got:
+        return 1.0 if not gold and not got else 0.0
 
-    return 2 * p * r / (p + r) if (p + r) else 0
+    # Bit-parallel set algebra: tp/fp/fn reduce to masked popcounts. The
+    # shared oov table keeps hallucinated labels consistent across the two
+    # masks without touching module state.
+    oov_bits: dict[str, int] = {}
+    return f1_packed(pack_labels(gold, oov_bits), pack_labels(got, oov_bits))
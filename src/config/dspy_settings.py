@@ -1,9 +1,16 @@
 import dspy
 
+_cache_configured = False
+
 
 def configure_dspy(lm: dspy.LM) -> None:
-    dspy.configure_cache(
-        enable_disk_cache=False,
-        enable_memory_cache=False,
-    )
+    # Cache settings are process-wide; only the first call needs to pay for
+    # reconstructing dspy's cache object. Later calls just swap the LM.
+    global _cache_configured
+    if not _cache_configured:
+        dspy.configure_cache(
+            enable_disk_cache=False,
+            enable_memory_cache=False,
+        )
+        _cache_configured = True
     dspy.settings.configure(lm=lm)
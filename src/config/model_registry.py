@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 import dspy
 
@@ -51,7 +52,10 @@ MODEL_REGISTRY = {
 }
 
 
+@lru_cache(maxsize=None)
 def load_model(name: str, *, reasoning_effort: str | None = None):
+    # LM construction sets up HTTP client pools and tokenisers, which is
+    # expensive enough to be worth reusing on repeat lookups.
     if name not in MODEL_REGISTRY:
         raise ValueError(f"Unknown model: {name}")
 
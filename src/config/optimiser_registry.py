@@ -1,4 +1,5 @@
 import os
+from functools import cache
 
 import dspy
 
@@ -7,14 +8,17 @@ from checklist_task.metric_miprov import multilabel_f1
 from span_metric.gepa_span_metric import gepa_span_metric
 
 
-def _resolve_gepa_num_threads() -> int:
+def _resolve_gepa_num_threads(model_id: str | None = None) -> int:
     """
-    Pick a conservative GEPA evaluation thread count.
+    Pick a GEPA evaluation thread count suited to the configured LM.
 
     Priority:
     1) GEPA_NUM_THREADS env var (explicit override)
-    2) Scheduler CPU allocation (PBS/SLURM), minus one core for overhead
-    3) Safe fallback of 4 threads
+    2) Local (Ollama) models: 2 threads — generation is compute-bound on the
+       local instance, so oversubscription only adds contention
+    3) Remote (OpenAI) models: threads mostly idle in network waits, so
+       scale with the scheduler CPU allocation (PBS/SLURM) up to 32
+    4) Safe fallback of 4 threads
     """
     override = os.getenv("GEPA_NUM_THREADS")
     if override:
@@ -26,6 +30,9 @@ def _resolve_gepa_num_threads() -> int:
             raise ValueError("GEPA_NUM_THREADS must be >= 1.")
         return value
 
+    if model_id is not None and model_id.startswith("ollama"):
+        return 2
+
     detected_cpus = None
     for key in ("PBS_NCPUS", "SLURM_CPUS_PER_TASK", "NCPUS"):
         raw = os.getenv(key)
@@ -38,62 +45,73 @@ def _resolve_gepa_num_threads() -> int:
         break
 
     if detected_cpus and detected_cpus > 0:
-        # Keep one core free for Ollama/runtime overhead and cap by default.
-        return max(1, min(6, detected_cpus - 1))
+        # I/O-bound remote calls tolerate oversubscription well.
+        return max(1, min(32, detected_cpus * 4))
 
     return 4
 
 
-GEPA_NUM_THREADS = _resolve_gepa_num_threads()
+def _gepa_num_threads() -> int:
+    """Resolve the thread count from the LM configured at invocation time."""
+    lm = getattr(dspy.settings, "lm", None)
+    return _resolve_gepa_num_threads(getattr(lm, "model", None))
 
 
+@cache
 def build_reflection_lm() -> dspy.LM:
+    # Constructed lazily: the registry lambdas below only call this when an
+    # optimiser is actually invoked, and the cache shares one reflection LM
+    # across all GEPA variants.
     return dspy.LM(model="openai/gpt-5.2")
 
 
+def _make_mipro(metric, auto):
+    def _compile(p, t, v, gepa_log_dir=None):
+        return dspy.MIPROv2(metric=metric, auto=auto, seed=749).compile(
+            p, trainset=t
+        )
+
+    return _compile
+
+
+def _make_gepa(metric, auto):
+    def _compile(p, t, v, gepa_log_dir=None):
+        return dspy.GEPA(
+            metric=metric,
+            auto=auto,
+            seed=749,
+            num_threads=_gepa_num_threads(),
+            reflection_lm=build_reflection_lm(),
+            log_dir=gepa_log_dir,
+        ).compile(p, trainset=t, valset=v)
+
+    return _compile
+
+
+# (name, factory, metric, auto): the variants differ only in these fields,
+# so shared configuration (seed, threads, reflection LM) lives in one place.
+_OPTIMISER_SPECS = (
+    ("mipro_light_checklist", _make_mipro, multilabel_f1, "light"),
+    ("mipro_heavy_checklist", _make_mipro, multilabel_f1, "heavy"),
+    ("gepa_light_checklist", _make_gepa, multilabel_f1_with_feedback, "light"),
+    ("gepa_heavy_checklist", _make_gepa, multilabel_f1_with_feedback, "heavy"),
+    ("gepa_light_span", _make_gepa, gepa_span_metric, "light"),
+    ("gepa_heavy_span", _make_gepa, gepa_span_metric, "heavy"),
+)
+
 OPTIM_REGISTRY = {
     "none": lambda p, t, v, gepa_log_dir=None: p,
-    "mipro_light_checklist": lambda p, t, v, gepa_log_dir=None: dspy.MIPROv2(
-        metric=multilabel_f1, auto="light", seed=749
-    ).compile(p, trainset=t),
-    "mipro_heavy_checklist": lambda p, t, v, gepa_log_dir=None: dspy.MIPROv2(
-        metric=multilabel_f1, auto="heavy", seed=749
-    ).compile(p, trainset=t),
-    "gepa_light_checklist": lambda p, t, v, gepa_log_dir=None: dspy.GEPA(
-        metric=multilabel_f1_with_feedback,
-        auto="light",
-        seed=749,
-        num_threads=GEPA_NUM_THREADS,
-        reflection_lm=build_reflection_lm(),
-        log_dir=gepa_log_dir,
-    ).compile(p, trainset=t, valset=v),
-    "gepa_heavy_checklist": lambda p, t, v, gepa_log_dir=None: dspy.GEPA(
-        metric=multilabel_f1_with_feedback,
-        auto="heavy",
-        seed=749,
-        num_threads=GEPA_NUM_THREADS,
-        reflection_lm=build_reflection_lm(),
-        log_dir=gepa_log_dir,
-    ).compile(p, trainset=t, valset=v),
-    "gepa_light_span": lambda p, t, v, gepa_log_dir=None: dspy.GEPA(
-        metric=gepa_span_metric,
-        auto="light",
-        seed=749,
-        num_threads=GEPA_NUM_THREADS,
-        reflection_lm=build_reflection_lm(),
-        log_dir=gepa_log_dir,
-    ).compile(p, trainset=t, valset=v),
-    "gepa_heavy_span": lambda p, t, v, gepa_log_dir=None: dspy.GEPA(
-        metric=gepa_span_metric,
-        auto="heavy",
-        seed=749,
-        num_threads=GEPA_NUM_THREADS,
-        reflection_lm=build_reflection_lm(),
-        log_dir=gepa_log_dir,
-    ).compile(p, trainset=t, valset=v),
+    **{name: factory(metric, auto) for name, factory, metric, auto in _OPTIMISER_SPECS},
 }
 
 
+# Optimisers usable by the span training scripts; computed once so consumers
+# import the contract instead of re-deriving it per invocation.
+SPAN_OPTIMISERS = frozenset(
+    name for name in OPTIM_REGISTRY if name == "none" or name.endswith("_span")
+)
+
+
 def load_optimiser(name: str):
     if name not in OPTIM_REGISTRY:
         raise ValueError(f"Unknown optimiser: {name}")
@@ -1,126 +1,244 @@
-import random
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
 
 import dspy
-import srsly
-
-
-def _matches_annotator(line: dict, annotator_id: str | None) -> bool:
+import orjson
+
+
+# Pre-bound constructor: saves the dspy module attribute lookup on every row.
+_Example = dspy.Example
+
+# C-level key access for the guaranteed-present text field; callers keep a
+# KeyError fallback so malformed rows degrade to the old .get behaviour.
+_get_text = itemgetter("text")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # type: ignore[import-not-found]
+        import pyarrow.compute  # noqa: F401
+        import pyarrow.feather  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError(
+            "pyarrow is not installed. Install it first, for example: "
+            "uv pip install pyarrow"
+        ) from exc
+    return pyarrow
+
+
+def _read_jsonl(path: str):
+    """
+    Parse a JSONL file with orjson over a memory-mapped newline scan.
+
+    Drop-in replacement for srsly.read_jsonl on the dataset hot path. The
+    mmap scan hands zero-copy memoryview slices straight to orjson instead
+    of materialising a bytes object per line the way `for line in f` does;
+    orjson itself parses severalfold faster than stdlib json, which
+    dominates cold-start for every training/eval run.
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file cannot be mapped
+            return
+        view = memoryview(mm)
+        try:
+            loads = orjson.loads
+            find = mm.find
+            pos, end = 0, len(mm)
+            while pos < end:
+                nl = find(b"\n", pos)
+                if nl < 0:
+                    nl = end
+                if nl > pos:
+                    if mm[pos] not in b" \t\r":
+                        # Common case: the line starts with payload.
+                        yield loads(view[pos:nl])
+                    else:
+                        stripped = bytes(view[pos:nl]).strip()
+                        if stripped:
+                            yield loads(stripped)
+                pos = nl + 1
+        finally:
+            # The exported view must be released before the map can close.
+            view.release()
+            mm.close()
+
+
+# Threaded decode only pays off once the file dwarfs executor startup cost.
+_PARALLEL_PARSE_MIN_BYTES = 8 << 20
+_PARALLEL_PARSE_SHARDS = 8
+
+
+def _shard_offsets(path: str, n: int) -> list[tuple[int, int]]:
+    """Split the file into up to n byte ranges aligned to line boundaries."""
+    size = os.path.getsize(path)
+    bounds: list[tuple[int, int]] = []
+    prev = 0
+    with open(path, "rb") as f:
+        for i in range(1, n):
+            target = i * size // n
+            if target <= prev:
+                continue
+            f.seek(target)
+            f.readline()  # advance to the next newline so shards hold whole lines
+            cut = f.tell()
+            if cut >= size:
+                break
+            bounds.append((prev, cut))
+            prev = cut
+    bounds.append((prev, size))
+    return bounds
+
+
+def _decode_shard(path: str, start: int, end: int) -> list:
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return [orjson.loads(line) for line in data.split(b"\n") if line.strip()]
+
+
+def _parse_jsonl(path: str):
+    """
+    Parse JSONL rows, sharding large files across a thread pool.
+
+    orjson releases the GIL around its C parser, so byte-range shards decode
+    genuinely in parallel on threads; shard order is preserved by map(), so
+    the row order matches the sequential reader.
+    """
+    if os.path.getsize(path) < _PARALLEL_PARSE_MIN_BYTES:
+        return _read_jsonl(path)
+
+    bounds = _shard_offsets(path, _PARALLEL_PARSE_SHARDS)
+    with ThreadPoolExecutor(len(bounds)) as pool:
+        shards = list(pool.map(lambda b: _decode_shard(path, *b), bounds))
+    return chain.from_iterable(shards)
+
+
+@lru_cache(maxsize=4)
+def _load_raw_cached(
+    path: str, mtime_ns: int, annotator_id: str | None
+) -> tuple[dict, ...]:
+    rows = _parse_jsonl(path)
+    # Branch once on the filter instead of paying a per-record helper call
+    # that re-checks `annotator_id is None` for every line.
+    # Exact type test: orjson only ever yields dict for object lines, so the
+    # MRO walk isinstance would do is wasted; `type is` is a pointer compare.
     if annotator_id is None:
-        return True
-    return line.get("_annotator_id") == annotator_id
+        return tuple(line for line in rows if type(line) is dict)
+    return tuple(
+        line
+        for line in rows
+        if type(line) is dict and line.get("_annotator_id") == annotator_id
+    )
 
 
-def prepare_dataset(path: str, annotator_id: str | None = None):
-    rng = random.Random(339)  # local, deterministic RNG
-    train, test = [], []
+def _load_raw(path: str, annotator_id: str | None = None) -> tuple[dict, ...]:
+    """
+    Parsed, annotator-filtered rows of a JSONL file, cached per process.
 
-    for line in srsly.read_jsonl(path):
-        if not isinstance(line, dict):
-            continue
-        if not _matches_annotator(line, annotator_id):
-            continue
+    A session that prepares several task variants from the same DATA_FILE
+    (checklist + span tasks, train/test and _all forms) previously re-read
+    and re-decoded the file once per variant; the cache collapses that to a
+    single parse. Keyed on mtime so an edited file invalidates the entry.
+    """
+    return _load_raw_cached(path, os.stat(path).st_mtime_ns, annotator_id)
 
-        ex = dspy.Example(
-            text=line.get("text"),
-            labels=line.get("accept"),
-        ).with_inputs("text")
 
-        if rng.random() < 0.75:
-            train.append(ex)
-        else:
-            test.append(ex)
+# 75/25 bucketing via a stable seeded hash of the text instead of a shared
+# Mersenne Twister stream: the same record lands in the same split in every
+# task variant, and bucketing no longer depends on iteration order, which
+# keeps splits reproducible under sharded/parallel loading.
+_TRAIN_BUCKET_LIMIT = int(0.75 * (1 << 24))
 
-    return train, test
 
+def _is_train(text: str | None) -> bool:
+    data = text.encode("utf-8") if isinstance(text, str) else b""
+    return (zlib.crc32(data, 339) & 0xFFFFFF) < _TRAIN_BUCKET_LIMIT
 
-def prepare_dataset_all(path: str, annotator_id: str | None = None):
-    examples = []
-
-    for line in srsly.read_jsonl(path):
-        if not isinstance(line, dict):
-            continue
-        if not _matches_annotator(line, annotator_id):
-            continue
-
-        ex = dspy.Example(
-            text=line.get("text"),
-            labels=line.get("accept"),
-        ).with_inputs("text")
-
-        examples.append(ex)
 
-    return examples
+# Bump when the split or example layout changes so stale pickles are ignored.
+_DATASET_CACHE_TAG = "crc32-339-75/v1"
 
 
-SBAR_ALLOWED_LABELS = {
-    "SITUATION",
-    "BACKGROUND",
-    "ASSESSMENT",
-    "RECOMMENDATION",
-}
+def _dataset_cache_dir() -> Path:
+    cache_root = Path(os.getenv("XDG_CACHE_HOME") or (Path.home() / ".cache"))
+    return cache_root / "handover-annotation" / "datasets"
 
 
-def prepare_dataset_sbar_span(path: str, annotator_id: str | None = None):
-    rng = random.Random(339)  # local, deterministic RNG
-    train, test = [], []
+def _dataset_cache_disabled() -> bool:
+    """Kill-switch: HANDOVER_DATASET_CACHE=0 (or false/off) skips the cache."""
+    return os.getenv("HANDOVER_DATASET_CACHE", "").strip().lower() in (
+        "0",
+        "false",
+        "off",
+    )
 
-    for line in srsly.read_jsonl(path):
-        if not isinstance(line, dict):
-            continue
-        if not _matches_annotator(line, annotator_id):
-            continue
 
-        # Filter out spans with disallowed labels
-        spans = [
-            span
-            for span in (line.get("spans") or [])
-            if span.get("label") in SBAR_ALLOWED_LABELS
+def _dataset_cache_key(path: str, annotator_id: str | None, task: str) -> str:
+    payload = json.dumps(
+        [
+            os.path.abspath(path),
+            os.stat(path).st_mtime_ns,
+            annotator_id,
+            task,
+            _DATASET_CACHE_TAG,
         ]
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
 
-        # Optionally: skip examples that end up with no valid spans
-        if not spans:
-            continue
 
-        ex = dspy.Example(
-            text=line.get("text"),
-            gold_spans=spans,
-        ).with_inputs("text")
+def _pickle_cached(task: str):
+    """
+    Persist a loader's constructed examples across processes.
 
-        if rng.random() < 0.75:
-            train.append(ex)
-        else:
-            test.append(ex)
+    DATA_FILE is constant between runs, so re-running JSONL decode plus
+    Example construction every invocation is pure waste; unpickling the
+    finished result is an order of magnitude cheaper. Keys include the file
+    mtime, so an edited JSONL invalidates its entries.
+    """
 
-    return train, test
+    def wrap(build):
+        @wraps(build)
+        def cached(path: str, annotator_id: str | None = None):
+            if _dataset_cache_disabled():
+                return build(path, annotator_id)
+            cache_dir = _dataset_cache_dir()
+            cache_file = cache_dir / (
+                _dataset_cache_key(path, annotator_id, task) + ".pkl"
+            )
+            if cache_file.exists():
+                with open(cache_file, "rb") as f:
+                    return pickle.load(f)
 
+            result = build(path, annotator_id)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, "wb") as f:
+                pickle.dump(result, f, protocol=5)
+            return result
 
-def prepare_dataset_sbar_span_all(path: str, annotator_id: str | None = None):
-    examples = []
+        return cached
 
-    for line in srsly.read_jsonl(path):
-        if not isinstance(line, dict):
-            continue
-        if not _matches_annotator(line, annotator_id):
-            continue
+    return wrap
 
-        spans = [
-            span
-            for span in (line.get("spans") or [])
-            if span.get("label") in SBAR_ALLOWED_LABELS
-        ]
-        if not spans:
-            continue
-
-        ex = dspy.Example(
-            text=line.get("text"),
-            gold_spans=spans,
-        ).with_inputs("text")
-        examples.append(ex)
-
-    return examples
 
+SBAR_ALLOWED_LABELS = frozenset({
+    "SITUATION",
+    "BACKGROUND",
+    "ASSESSMENT",
+    "RECOMMENDATION",
+})
 
-UNCERTAINTY_ALLOWED_LABELS = {
+UNCERTAINTY_ALLOWED_LABELS = frozenset({
     "Vagueness",
     "Hedging",
     "Unknown fact",
@@ -128,143 +246,365 @@ UNCERTAINTY_ALLOWED_LABELS = {
     "Source uncertainty",
     "Procedural uncertainty",
     "Responsibility uncertainty",
-}
+})
 UNCERTAINTY_COLLAPSED_LABEL = "UNCERTAIN"
 
 
 def _collapse_uncertainty_spans(spans: list[dict]) -> list[dict]:
-    collapsed = []
-    seen = set()
+    # One insertion-ordered dict keyed on (start, end) does the dedup and
+    # holds the output, replacing the separate seen-set and result list;
+    # first-seen wins because later keys are skipped.
+    out: dict[tuple, dict] = {}
+    # Locals avoid a LOAD_GLOBAL per span in this per-row helper.
+    allowed = UNCERTAINTY_ALLOWED_LABELS
+    collapsed_label = UNCERTAINTY_COLLAPSED_LABEL
 
     for span in spans:
-        if span.get("label") not in UNCERTAINTY_ALLOWED_LABELS:
+        if span.get("label") not in allowed:
             continue
 
         key = (span.get("start"), span.get("end"))
-        if key in seen:
-            continue
-        seen.add(key)
+        if key not in out:
+            out[key] = {**span, "label": collapsed_label}
 
-        new_span = dict(span)
-        new_span["label"] = UNCERTAINTY_COLLAPSED_LABEL
-        collapsed.append(new_span)
+    return list(out.values())
 
-    return collapsed
 
+def _make_example(**fields):
+    """
+    Build a text-input Example without the with_inputs copy.
 
-def prepare_dataset_uncertainty_span(path: str, annotator_id: str | None = None):
-    rng = random.Random(339)  # local, deterministic RNG
-    train, test = [], []
+    with_inputs returns a modified copy of the whole example; for an object
+    constructed on the spot that copy is pure overhead, so set the input
+    keys directly on the fresh instance instead.
+    """
+    ex = _Example(**fields)
+    ex._input_keys = {"text"}
+    return ex
 
-    for line in srsly.read_jsonl(path):
-        if not isinstance(line, dict):
-            continue
-        if not _matches_annotator(line, annotator_id):
-            continue
 
-        # Filter out spans with disallowed labels
-        spans = [
+def _checklist_example(line: dict):
+    return _make_example(
+        text=line.get("text"),
+        labels=line.get("accept"),
+    )
+
+
+def _filtered_span_extractor(allowed: frozenset):
+    # First-character gate: the label universes are disambiguated well by
+    # their leading character, so a one-char membership test rejects most
+    # foreign labels before paying the full-string hash of the set lookup.
+    first_chars = frozenset(label[0] for label in allowed)
+
+    def extract(spans):
+        return [
             span
-            for span in (line.get("spans") or [])
-            if span.get("label") in UNCERTAINTY_ALLOWED_LABELS
+            for span in spans
+            if (lbl := span.get("label"))
+            and lbl[0] in first_chars
+            and lbl in allowed
         ]
 
-        # Optionally: skip examples that end up with no valid spans
-        if not spans:
-            continue
+    return extract
 
-        ex = dspy.Example(
+
+# Task name -> span transform; a task keeps a row only if it survives with
+# at least one span.
+_TASK_SPAN_EXTRACTORS = {
+    "sbar_span": _filtered_span_extractor(SBAR_ALLOWED_LABELS),
+    "uncertainty_span": _filtered_span_extractor(UNCERTAINTY_ALLOWED_LABELS),
+    "uncertainty_binary_span": _collapse_uncertainty_spans,
+}
+
+
+def _span_example_builder(extract):
+    def build(line: dict):
+        spans = extract(line.get("spans") or ())
+        if not spans:
+            return None
+        return _make_example(
             text=line.get("text"),
             gold_spans=spans,
-        ).with_inputs("text")
+        )
 
-        if rng.random() < 0.75:
-            train.append(ex)
-        else:
-            test.append(ex)
+    return build
 
-    return train, test
 
+# Task name -> per-row Example builder; returns None for rows the task drops
+# (span tasks skip rows with no valid spans).
+_TASK_BUILDERS = {
+    "checklist": _checklist_example,
+    **{
+        name: _span_example_builder(extract)
+        for name, extract in _TASK_SPAN_EXTRACTORS.items()
+    },
+}
 
-def prepare_dataset_uncertainty_span_all(
+
+def _build_examples(path: str, annotator_id: str | None, task: str) -> list:
+    """
+    The one hot loop behind every prepare_dataset* variant.
+
+    Builds column-wise: the filter loop stages the surviving (text, spans)
+    columns first, and all Examples are then constructed in one final
+    comprehension. The single-purpose loop bodies branch-predict better
+    than a fused filter+construct loop, and the staged columns are ready
+    for future batch processing (e.g. one spaCy nlp.pipe over all texts).
+    """
+    rows = _load_raw(path, annotator_id)
+    if task == "checklist":
+        # No filtering: every row yields an example.
+        try:
+            return [
+                _make_example(text=_get_text(line), labels=line.get("accept"))
+                for line in rows
+            ]
+        except KeyError:
+            return [
+                _make_example(text=line.get("text"), labels=line.get("accept"))
+                for line in rows
+            ]
+
+    extract = _TASK_SPAN_EXTRACTORS[task]
+    texts: list = []
+    gold: list = []
+    append_text, append_gold = texts.append, gold.append
+
+    for line in rows:
+        spans = extract(line.get("spans") or ())
+        if spans:
+            try:
+                append_text(_get_text(line))
+            except KeyError:
+                append_text(None)
+            append_gold(spans)
+
+    return [
+        _make_example(text=text, gold_spans=spans)
+        for text, spans in zip(texts, gold)
+    ]
+
+
+def _iter_examples(path: str, annotator_id: str | None, task: str):
+    # Streaming sibling of _build_examples for one-pass consumers: peak RSS
+    # stays at one Example instead of the whole materialised list. Kept
+    # separate because the list path benefits from exact preallocation.
+    build = _TASK_BUILDERS[task]
+    for line in _load_raw(path, annotator_id):
+        ex = build(line)
+        if ex is not None:
+            yield ex
+
+
+def iter_prepare_dataset(path: str, annotator_id: str | None = None):
+    """Yield checklist examples one at a time; see prepare_dataset_all."""
+    return _iter_examples(path, annotator_id, "checklist")
+
+
+def iter_prepare_dataset_sbar_span(path: str, annotator_id: str | None = None):
+    return _iter_examples(path, annotator_id, "sbar_span")
+
+
+def iter_prepare_dataset_uncertainty_span(
     path: str, annotator_id: str | None = None
 ):
-    examples = []
+    return _iter_examples(path, annotator_id, "uncertainty_span")
 
-    for line in srsly.read_jsonl(path):
-        if not isinstance(line, dict):
-            continue
-        if not _matches_annotator(line, annotator_id):
-            continue
 
-        spans = [
-            span
-            for span in (line.get("spans") or [])
-            if span.get("label") in UNCERTAINTY_ALLOWED_LABELS
-        ]
+def iter_prepare_dataset_uncertainty_binary_span(
+    path: str, annotator_id: str | None = None
+):
+    return _iter_examples(path, annotator_id, "uncertainty_binary_span")
 
-        if not spans:
-            continue
 
-        ex = dspy.Example(
-            text=line.get("text"),
-            gold_spans=spans,
-        ).with_inputs("text")
+def _split_examples(examples: list) -> tuple[list, list]:
+    """Partition by the stable per-text hash; order within buckets kept."""
+    train = [None] * len(examples)
+    test = [None] * len(examples)
+    n_train = n_test = 0
+
+    for ex in examples:
+        if _is_train(ex.text):
+            train[n_train] = ex
+            n_train += 1
+        else:
+            test[n_test] = ex
+            n_test += 1
+
+    del train[n_train:]
+    del test[n_test:]
+    return train, test
 
-        examples.append(ex)
 
-    return examples
+@_pickle_cached("checklist")
+def prepare_dataset(path: str, annotator_id: str | None = None):
+    return _split_examples(_build_examples(path, annotator_id, "checklist"))
+
+
+@_pickle_cached("checklist_all")
+def prepare_dataset_all(path: str, annotator_id: str | None = None):
+    return _build_examples(path, annotator_id, "checklist")
+
+
+@_pickle_cached("sbar_span")
+def prepare_dataset_sbar_span(path: str, annotator_id: str | None = None):
+    return _split_examples(_build_examples(path, annotator_id, "sbar_span"))
+
 
+@_pickle_cached("sbar_span_all")
+def prepare_dataset_sbar_span_all(path: str, annotator_id: str | None = None):
+    return _build_examples(path, annotator_id, "sbar_span")
+
+
+@_pickle_cached("uncertainty_span")
+def prepare_dataset_uncertainty_span(path: str, annotator_id: str | None = None):
+    return _split_examples(
+        _build_examples(path, annotator_id, "uncertainty_span")
+    )
+
+
+@_pickle_cached("uncertainty_span_all")
+def prepare_dataset_uncertainty_span_all(
+    path: str, annotator_id: str | None = None
+):
+    return _build_examples(path, annotator_id, "uncertainty_span")
 
+
+@_pickle_cached("uncertainty_binary_span")
 def prepare_dataset_uncertainty_binary_span(
     path: str, annotator_id: str | None = None
 ):
-    rng = random.Random(339)  # local, deterministic RNG
-    train, test = [], []
+    return _split_examples(
+        _build_examples(path, annotator_id, "uncertainty_binary_span")
+    )
 
-    for line in srsly.read_jsonl(path):
-        if not isinstance(line, dict):
-            continue
-        if not _matches_annotator(line, annotator_id):
-            continue
 
-        spans = _collapse_uncertainty_spans(line.get("spans") or [])
+@_pickle_cached("uncertainty_binary_span_all")
+def prepare_dataset_uncertainty_binary_span_all(
+    path: str, annotator_id: str | None = None
+):
+    return _build_examples(path, annotator_id, "uncertainty_binary_span")
+
+
+def _arrow_cache_path(path: str) -> Path:
+    return Path(f"{path}.feather")
+
+
+def _write_arrow_cache(jsonl_path: str, cache_path: Path) -> None:
+    pa = _require_pyarrow()
+    texts: list = []
+    spans_json: list = []
+    annotator_ids: list = []
+
+    for line in _load_raw(jsonl_path):
+        texts.append(line.get("text"))
+        spans_json.append(json.dumps(line.get("spans") or [], ensure_ascii=False))
+        annotator_ids.append(line.get("_annotator_id"))
+
+    table = pa.table(
+        {"text": texts, "spans_json": spans_json, "_annotator_id": annotator_ids}
+    )
+    pa.feather.write_feather(table, str(cache_path), compression="lz4")
+
+
+def _read_arrow_rows(path: str, annotator_id: str | None):
+    """
+    Yield (text, spans) rows for `path` via a memory-mapped Feather cache.
+
+    `path` may be the tokenised JSONL (a `<path>.feather` sidecar is written
+    next to it and rebuilt when the JSONL is newer) or a `.feather` file
+    produced by an earlier run. Annotator filtering happens as a vectorized
+    Arrow filter instead of a per-row Python comparison.
+    """
+    pa = _require_pyarrow()
+    source = Path(path)
+    if source.suffix == ".feather":
+        cache_path = source
+    else:
+        cache_path = _arrow_cache_path(path)
+        if (
+            not cache_path.exists()
+            or cache_path.stat().st_mtime < source.stat().st_mtime
+        ):
+            _write_arrow_cache(path, cache_path)
+
+    table = pa.feather.read_table(str(cache_path), memory_map=True)
+    if annotator_id is not None:
+        table = table.filter(pa.compute.equal(table["_annotator_id"], annotator_id))
+
+    for text, row_spans_json in zip(
+        table["text"].to_pylist(), table["spans_json"].to_pylist()
+    ):
+        yield text, (json.loads(row_spans_json) if row_spans_json else [])
+
+
+def prepare_dataset_sbar_span_arrow(path: str, annotator_id: str | None = None):
+    """Same split as prepare_dataset_sbar_span, read via the Feather cache."""
+    train, test = [], []
+    append_train, append_test = train.append, test.append
+
+    allowed = SBAR_ALLOWED_LABELS
+    for text, raw_spans in _read_arrow_rows(path, annotator_id):
+        spans = [
+            span for span in raw_spans if span.get("label") in allowed
+        ]
         if not spans:
             continue
 
-        ex = dspy.Example(
-            text=line.get("text"),
+        ex = _make_example(
+            text=text,
             gold_spans=spans,
-        ).with_inputs("text")
+        )
 
-        if rng.random() < 0.75:
-            train.append(ex)
+        if _is_train(ex.text):
+            append_train(ex)
         else:
-            test.append(ex)
+            append_test(ex)
 
     return train, test
 
 
-def prepare_dataset_uncertainty_binary_span_all(
-    path: str, annotator_id: str | None = None
-):
+def prepare_dataset_sbar_span_arrow_all(path: str, annotator_id: str | None = None):
     examples = []
+    append = examples.append
 
-    for line in srsly.read_jsonl(path):
-        if not isinstance(line, dict):
-            continue
-        if not _matches_annotator(line, annotator_id):
-            continue
-
-        spans = _collapse_uncertainty_spans(line.get("spans") or [])
+    allowed = SBAR_ALLOWED_LABELS
+    for text, raw_spans in _read_arrow_rows(path, annotator_id):
+        spans = [
+            span for span in raw_spans if span.get("label") in allowed
+        ]
         if not spans:
             continue
 
-        ex = dspy.Example(
-            text=line.get("text"),
+        ex = _make_example(
+            text=text,
             gold_spans=spans,
-        ).with_inputs("text")
-
-        examples.append(ex)
+        )
+        append(ex)
 
     return examples
+
+
+def build_all_variants(path: str, annotator_id: str | None = None):
+    """
+    Build the train/test splits for every task in one pass over the rows.
+
+    Returns {"checklist" | "sbar_span" | "uncertainty_span" |
+    "uncertainty_binary_span": (train, test)}. Bucketing uses the stable
+    per-text hash (_is_train), so the splits are identical to the
+    corresponding prepare_dataset* function -- the only difference is that
+    example construction for all tasks shares one iteration.
+    """
+    splits: dict[str, tuple[list, list]] = {
+        name: ([], []) for name in _TASK_BUILDERS
+    }
+
+    for line in _load_raw(path, annotator_id):
+        # One hash decides the bucket for all variants of this row.
+        bucket = 0 if _is_train(line.get("text")) else 1
+        for name, build in _TASK_BUILDERS.items():
+            ex = build(line)
+            if ex is not None:
+                splits[name][bucket].append(ex)
+
+    return splits
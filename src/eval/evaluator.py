@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import concurrent.futures
+import contextlib
+import heapq
 import json
+import mmap
+import os
+import queue
+import random
+import re
+import sys
+import threading
 import time
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterable, Sequence
 
 import dspy
+import orjson
 import srsly
 
 from checklist_task.metric_gepa import multilabel_f1_with_feedback
@@ -14,20 +26,117 @@ from span_metric.gepa_span_metric import gepa_span_metric
 
 _DEFAULT_MAX_RETRIES = 3
 _DEFAULT_RETRY_DELAY_SECONDS = 1.0
+_DEFAULT_MAX_BACKOFF_SECONDS = 30.0
+_DEFAULT_FLUSH_EVERY = 32
+# Tolerate non-string keys from metric/pred dicts; unknown object types
+# are handled by the _orjson_default hook.
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+_NEWLINE = b"\n"
+_TIMING_SLOWEST_TOP_K = 10
+_TIMING_CALIBRATION_PAIRS = 10_000
 
+_perf_overhead_seconds: float | None = None
 
-def _to_jsonable(value: Any) -> Any:
-    """Best-effort conversion for JSONL outputs."""
-    if hasattr(value, "toDict"):
+
+def _perf_counter_overhead_seconds() -> float:
+    """
+    Median cost of one back-to-back perf_counter() pair, measured once per
+    process. The sub-phase sums in the timing summary each include one pair
+    per example, which inflates microsecond-scale phases (metric, row build);
+    subtracting the calibrated overhead keeps those buckets comparable.
+    """
+    global _perf_overhead_seconds
+    if _perf_overhead_seconds is None:
+        perf_counter = time.perf_counter
+        deltas = []
+        for _ in range(_TIMING_CALIBRATION_PAIRS):
+            t0 = perf_counter()
+            t1 = perf_counter()
+            deltas.append(t1 - t0)
+        deltas.sort()
+        _perf_overhead_seconds = deltas[len(deltas) // 2]
+    return _perf_overhead_seconds
+
+
+def timing_sidecar_path(out_file: str) -> Path:
+    """Per-example timing rows live next to the eval JSONL results."""
+    return Path(f"{out_file}.timings.ndjson")
+
+
+def _cursor_path(out_file: str) -> Path:
+    return Path(f"{out_file}.cursor")
+
+
+def _write_cursor(
+    out_file: str,
+    next_idx: int,
+    score_sum: float,
+    error_count: int,
+    byte_offset: int,
+) -> None:
+    """Checkpoint resume state atomically (write-then-rename)."""
+    cursor_path = _cursor_path(out_file)
+    tmp_path = cursor_path.with_name(cursor_path.name + ".tmp")
+    tmp_path.write_bytes(
+        orjson.dumps(
+            {
+                "next_idx": next_idx,
+                "score_sum": score_sum,
+                "error_count": error_count,
+                "byte_offset": byte_offset,
+            }
+        )
+    )
+    os.replace(tmp_path, cursor_path)
+
+
+def _read_cursor(out_file: str) -> tuple[int, float, int] | None:
+    """
+    Resume state from the cursor sidecar, or None when it is missing or
+    stale. The stored byte_offset must match the results file exactly; any
+    mismatch (crash between a flush and its checkpoint, hand-edited file)
+    rejects the cursor so resume falls back to scanning the rows.
+    """
+    try:
+        cursor = orjson.loads(_cursor_path(out_file).read_bytes())
+        if Path(out_file).stat().st_size != cursor["byte_offset"]:
+            return None
+        return (
+            int(cursor["next_idx"]),
+            float(cursor["score_sum"]),
+            int(cursor["error_count"]),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _orjson_default(value: Any) -> Any:
+    """
+    Hook for types orjson cannot encode natively. orjson walks containers
+    in C and only surfaces unknown nodes here, so dspy Example/Prediction
+    objects unwrap via toDict without a Python-level traversal of the rest
+    of the row; anything else degrades to str() instead of aborting a long
+    run at write time.
+    """
+    to_dict = getattr(type(value), "toDict", None)
+    if to_dict is not None:
         try:
-            return value.toDict()
+            return to_dict(value)
         except Exception:
             pass
-    if isinstance(value, dict):
-        return {k: _to_jsonable(v) for k, v in value.items()}
-    if isinstance(value, (list, tuple)):
-        return [_to_jsonable(v) for v in value]
-    return value
+    return str(value)
+
+
+_EXECUTOR_SHUTDOWN_MESSAGE = "cannot schedule new futures after shutdown"
+_EXECUTOR_RESET_MIN_INTERVAL_SECONDS = 1.0
+_last_executor_reset_at = 0.0
+
+# Resolved once so the reset path never pays an import-system lookup from
+# inside a retry loop; dspy pulls litellm in anyway, but guard regardless.
+try:
+    import litellm.utils as _litellm_utils
+except Exception:  # pragma: no cover - litellm is a dspy dependency
+    _litellm_utils = None
 
 
 def _reset_litellm_executor_if_shutdown(exc: Exception) -> bool:
@@ -35,22 +144,53 @@ def _reset_litellm_executor_if_shutdown(exc: Exception) -> bool:
     LiteLLM uses a global executor internally. In some HPC runs this can be shut
     down prematurely, causing RuntimeError on later requests. Reset best-effort.
     """
-    if "cannot schedule new futures after shutdown" not in str(exc):
+    global _last_executor_reset_at
+
+    # Only RuntimeError carries the shutdown message; checking args[0]
+    # directly avoids str(exc), which for LiteLLM errors can render a large
+    # wrapped JSON payload on every retried failure.
+    if not isinstance(exc, RuntimeError):
+        return False
+    args = exc.args
+    if not (
+        args
+        and isinstance(args[0], str)
+        and _EXECUTOR_SHUTDOWN_MESSAGE in args[0]
+    ):
         return False
 
-    try:
-        import litellm.utils as litellm_utils
+    # Concurrent workers all see the same dead executor; one replacement is
+    # enough, so treat a fresh reset as already done.
+    now = time.monotonic()
+    if now - _last_executor_reset_at < _EXECUTOR_RESET_MIN_INTERVAL_SECONDS:
+        return True
 
-        old_executor = getattr(litellm_utils, "executor", None)
+    if _litellm_utils is None:
+        return False
+    try:
+        old_executor = getattr(_litellm_utils, "executor", None)
         max_workers = getattr(old_executor, "_max_workers", 64)
-        litellm_utils.executor = concurrent.futures.ThreadPoolExecutor(
+        _litellm_utils.executor = concurrent.futures.ThreadPoolExecutor(
             max_workers=max_workers
         )
+        _last_executor_reset_at = now
         return True
     except Exception:
         return False
 
 
+def _retry_after_seconds(exc: Exception) -> float | None:
+    """Server-requested delay from a rate-limit response, when present."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    retry_after = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+
 def _predict_with_retries(
     predictor: Any,
     inputs: dict[str, Any],
@@ -58,18 +198,23 @@ def _predict_with_retries(
     fallback_prediction_factory: Callable[[], Any],
     max_retries: int,
     retry_delay_seconds: float,
+    max_backoff_seconds: float = _DEFAULT_MAX_BACKOFF_SECONDS,
 ) -> tuple[Any, str | None, dict[str, Any]]:
+    # Hot-loop locals: attribute lookups on the time module cost a dict
+    # probe per call, paid several times per attempt.
+    perf_counter = time.perf_counter
+
     errors: list[str] = []
     attempt_durations: list[float] = []
     backoff_sleep_seconds = 0.0
-    prediction_started_at = time.perf_counter()
+    prediction_started_at = perf_counter()
 
     for attempt in range(1, max_retries + 1):
-        attempt_started_at = time.perf_counter()
+        attempt_started_at = perf_counter()
         try:
             pred = predictor(**inputs)
-            attempt_durations.append(time.perf_counter() - attempt_started_at)
-            total_seconds = time.perf_counter() - prediction_started_at
+            attempt_durations.append(perf_counter() - attempt_started_at)
+            total_seconds = perf_counter() - prediction_started_at
             return pred, None, {
                 "attempts": attempt,
                 "attempt_durations": attempt_durations,
@@ -78,18 +223,28 @@ def _predict_with_retries(
                 "succeeded": True,
             }
         except Exception as exc:
-            attempt_durations.append(time.perf_counter() - attempt_started_at)
+            attempt_durations.append(perf_counter() - attempt_started_at)
             reset_done = _reset_litellm_executor_if_shutdown(exc)
             message = f"attempt {attempt}/{max_retries}: {type(exc).__name__}: {exc}"
             if reset_done:
                 message += " [litellm executor reset]"
             errors.append(message)
             if attempt < max_retries:
-                sleep_seconds = retry_delay_seconds * attempt
+                # Exponential backoff with jitter: linear sleeps make
+                # rate-limited workers retry in lockstep and hammer the
+                # endpoint again together. A Retry-After header, when the
+                # provider sends one, takes precedence over our own guess.
+                sleep_seconds = min(
+                    retry_delay_seconds * (2 ** (attempt - 1)),
+                    max_backoff_seconds,
+                ) * random.uniform(0.5, 1.5)
+                retry_after = _retry_after_seconds(exc)
+                if retry_after is not None:
+                    sleep_seconds = max(sleep_seconds, retry_after)
                 backoff_sleep_seconds += sleep_seconds
                 time.sleep(sleep_seconds)
 
-    total_seconds = time.perf_counter() - prediction_started_at
+    total_seconds = perf_counter() - prediction_started_at
     return fallback_prediction_factory(), " | ".join(errors), {
         "attempts": max_retries,
         "attempt_durations": attempt_durations,
@@ -99,10 +254,53 @@ def _predict_with_retries(
     }
 
 
+def predict_with_retries(
+    predictor: Any,
+    inputs: dict[str, Any],
+    *,
+    max_retries: int = _DEFAULT_MAX_RETRIES,
+    retry_delay_seconds: float = _DEFAULT_RETRY_DELAY_SECONDS,
+    max_backoff_seconds: float = _DEFAULT_MAX_BACKOFF_SECONDS,
+) -> Any:
+    """
+    Call `predictor(**inputs)` with the evaluator's retry/backoff policy.
+
+    Used by the one-off run_test_* scripts so a transient 429/5xx does not
+    abort the run. Raises RuntimeError when every attempt fails.
+    """
+    pred, error, _ = _predict_with_retries(
+        predictor,
+        inputs,
+        fallback_prediction_factory=lambda: None,
+        max_retries=max_retries,
+        retry_delay_seconds=retry_delay_seconds,
+        max_backoff_seconds=max_backoff_seconds,
+    )
+    if error is not None:
+        raise RuntimeError(
+            f"Prediction failed after {max_retries} attempts: {error}"
+        )
+    return pred
+
+
+_INPUT_DROP_KEYS = frozenset({"labels", "gold_spans"})
+
+
+def _build_inputs(example: Any) -> dict[str, Any]:
+    """Input-field extraction, done once per example on the submitting side."""
+    if hasattr(example, "inputs"):
+        return example.inputs()
+    if isinstance(example, dict):
+        return {k: v for k, v in example.items() if k not in _INPUT_DROP_KEYS}
+    return {}
+
+
 def _metric_score(metric: Callable[..., Any], example: Any, pred: Any) -> tuple[float, str | None]:
     try:
         score = metric(example, pred)
-        return float(score), None
+        # Both shipped metrics already return float; skip the conversion's
+        # type dispatch on that path.
+        return score if type(score) is float else float(score), None
     except Exception as exc:
         return 0.0, f"{type(exc).__name__}: {exc}"
 
@@ -122,29 +320,165 @@ def _load_existing_rows(out_file: str) -> list[dict[str, Any]]:
     return rows
 
 
+_SCORE_RE = re.compile(rb'"score"\s*:\s*(-?[\d.eE+]+)')
+_ERROR_RE = re.compile(rb'"error"\s*:\s*\{')
+
+
+def _scan_existing_rows(out_file: str) -> tuple[int, float, int, bool]:
+    """
+    Resume bookkeeping for an existing results file: completed-row count,
+    prior score sum, prior error count, and whether the file already ends
+    with a newline (so appending need not re-open the file to check).
+
+    Completed rows are newline-delimited and each carries exactly one
+    numeric "score" key, so a raw mmap scan recovers everything resume needs
+    without json-parsing every row. Any disagreement between the newline and
+    score counts (hand-edited files, unexpected row shapes) falls back to
+    the full srsly parse.
+    """
+    path = Path(out_file)
+    if not path.exists() or path.stat().st_size == 0:
+        return 0, 0.0, 0, True
+
+    with path.open("rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            ends_with_newline = mm[-1:] == b"\n"
+            start_idx = 0
+            pos = mm.find(b"\n")
+            while pos != -1:
+                start_idx += 1
+                pos = mm.find(b"\n", pos + 1)
+            if not ends_with_newline:
+                # Final row was written without its trailing newline (e.g.
+                # the previous run died mid-flush); it still counts.
+                start_idx += 1
+            score_matches = _SCORE_RE.findall(mm)
+            if len(score_matches) == start_idx:
+                error_count = sum(1 for _ in _ERROR_RE.finditer(mm))
+                return (
+                    start_idx,
+                    sum(float(m) for m in score_matches),
+                    error_count,
+                    ends_with_newline,
+                )
+        finally:
+            mm.close()
+
+    rows = _load_existing_rows(out_file)
+    score_sum = 0.0
+    error_count = 0
+    for row in rows:
+        try:
+            score_sum += float(row.get("score", 0.0))
+        except (TypeError, ValueError):
+            pass
+        if row.get("error") is not None:
+            error_count += 1
+    return len(rows), score_sum, error_count, ends_with_newline
+
+
+def recommended_max_workers(predictor: Any = None) -> int:
+    """
+    Concurrency used for num_threads=0: the provider's advertised request
+    limit when the predictor's LM exposes one, otherwise a CPU-based guess
+    sized for an I/O-bound pool.
+    """
+    limit = getattr(
+        getattr(predictor, "lm", None), "max_concurrent_requests", None
+    )
+    if isinstance(limit, int) and limit > 0:
+        return limit
+    return min(32, (os.cpu_count() or 1) * 8)
+
+
+_VALIDATION_REPORT_LIMIT = 5
+
+
+def _validate_examples(
+    testset: Sequence[Any],
+    start_idx: int,
+    total: int,
+    metric: Callable[..., Any],
+    fallback_prediction_factory: Callable[[], Any],
+) -> None:
+    """
+    Pre-sweep the pending examples for schema errors before any LLM spend:
+    a testset whose examples cannot build inputs or whose metric raises on
+    every row would otherwise burn the full prediction budget just to
+    produce a file of zero-score error rows.
+    """
+    fallback_pred = fallback_prediction_factory()
+    failures: list[str] = []
+    for idx0 in range(start_idx, total):
+        example = testset[idx0]
+        try:
+            _build_inputs(example)
+            metric(example, fallback_pred)
+        except Exception as exc:
+            failures.append(f"example {idx0}: {type(exc).__name__}: {exc}")
+            if len(failures) > _VALIDATION_REPORT_LIMIT:
+                break
+    if failures:
+        shown = failures[:_VALIDATION_REPORT_LIMIT]
+        suffix = "" if len(failures) <= _VALIDATION_REPORT_LIMIT else ", ..."
+        raise ValueError(
+            "Testset failed validation before evaluation started: "
+            + "; ".join(shown)
+            + suffix
+        )
+
+
 def _run_eval(
     predictor: Any,
-    testset: list[Any],
+    testset: Sequence[Any] | Iterable[Any],
     out_file: str,
     *,
+    total: int | None = None,
     metric: Callable[..., Any],
     fallback_prediction_factory: Callable[[], Any],
     max_retries: int = _DEFAULT_MAX_RETRIES,
     retry_delay_seconds: float = _DEFAULT_RETRY_DELAY_SECONDS,
     resume: bool = True,
+    validate: bool = True,
     num_threads: int | None = None,
+    backend: str = "thread",
+    batch_size: int | None = None,
+    flush_every: int = _DEFAULT_FLUSH_EVERY,
     timing_logs: bool = False,
     timing_log_every: int = 1,
     timing_slow_threshold_seconds: float | None = None,
 ) -> float:
-    scores: list[float] = []
+    # Running sum instead of a per-example list: the average is the only
+    # consumer, so there is no need to hold 8 bytes per row for the run.
+    score_sum = 0.0
     error_count = 0
-    total = len(testset)
+    writer_error: list[Exception] = []
+    if total is None:
+        try:
+            total = len(testset)  # type: ignore[arg-type]
+        except TypeError:
+            raise ValueError(
+                "total is required when testset is an iterable without len()"
+            ) from None
     out_path = Path(out_file)
-    # Keep legacy behavior unless callers explicitly opt into parallelism.
-    effective_num_threads = 1 if num_threads is None else num_threads
-    if effective_num_threads < 1:
-        raise ValueError(f"num_threads must be >= 1, got {effective_num_threads}")
+    # Keep legacy behavior unless callers explicitly opt into parallelism;
+    # num_threads=0 requests an autoscaled pool.
+    if num_threads is None:
+        effective_num_threads = 1
+    elif num_threads == 0:
+        effective_num_threads = recommended_max_workers(predictor)
+        print(f"Autoscaled num_threads to {effective_num_threads}.")
+    elif num_threads < 0:
+        raise ValueError(f"num_threads must be >= 0, got {num_threads}")
+    else:
+        effective_num_threads = num_threads
+    if backend not in ("thread", "async"):
+        raise ValueError(f"backend must be 'thread' or 'async', got {backend!r}")
+    if batch_size is not None and batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    if flush_every < 1:
+        raise ValueError(f"flush_every must be >= 1, got {flush_every}")
     if timing_log_every < 1:
         raise ValueError(f"timing_log_every must be >= 1, got {timing_log_every}")
     if (
@@ -157,9 +491,13 @@ def _run_eval(
         )
 
     def process_example(
-        idx0: int, example: Any
-    ) -> tuple[int, dict[str, Any], float, bool, float, dict[str, Any], float]:
-        started_at = time.perf_counter()
+        idx0: int,
+        example: Any,
+        inputs: dict[str, Any],
+        pred: Any = None,
+    ) -> tuple[int, bytes, float, bool, float, dict[str, Any], float]:
+        perf_counter = time.perf_counter
+        started_at = perf_counter()
         timing: dict[str, Any] = {
             "inputs_seconds": 0.0,
             "prediction_seconds": 0.0,
@@ -170,45 +508,45 @@ def _run_eval(
             "prediction_backoff_seconds": 0.0,
             "prediction_succeeded": False,
         }
+        # Sub-phase timers only matter when rows reach the sidecar or the
+        # summary; without timing_logs the clock reads would dominate the
+        # fast phases they measure.
         try:
-            inputs_started_at = time.perf_counter()
-            if hasattr(example, "inputs"):
-                inputs = example.inputs()
-            elif isinstance(example, dict):
-                inputs = {
-                    k: v
-                    for k, v in example.items()
-                    if k != "labels" and k != "gold_spans"
-                }
+            if pred is None:
+                pred, pred_error, prediction_timing = _predict_with_retries(
+                    predictor,
+                    inputs,
+                    fallback_prediction_factory=fallback_prediction_factory,
+                    max_retries=max_retries,
+                    retry_delay_seconds=retry_delay_seconds,
+                )
+                timing["prediction_seconds"] = prediction_timing["total_seconds"]
+                timing["prediction_attempts"] = prediction_timing["attempts"]
+                timing["prediction_attempt_durations"] = prediction_timing[
+                    "attempt_durations"
+                ]
+                timing["prediction_backoff_seconds"] = prediction_timing[
+                    "backoff_sleep_seconds"
+                ]
+                timing["prediction_succeeded"] = prediction_timing["succeeded"]
             else:
-                inputs = {}
-            timing["inputs_seconds"] = time.perf_counter() - inputs_started_at
-
-            pred, pred_error, prediction_timing = _predict_with_retries(
-                predictor,
-                inputs,
-                fallback_prediction_factory=fallback_prediction_factory,
-                max_retries=max_retries,
-                retry_delay_seconds=retry_delay_seconds,
-            )
-            timing["prediction_seconds"] = prediction_timing["total_seconds"]
-            timing["prediction_attempts"] = prediction_timing["attempts"]
-            timing["prediction_attempt_durations"] = prediction_timing[
-                "attempt_durations"
-            ]
-            timing["prediction_backoff_seconds"] = prediction_timing[
-                "backoff_sleep_seconds"
-            ]
-            timing["prediction_succeeded"] = prediction_timing["succeeded"]
-
-            metric_started_at = time.perf_counter()
-            score, metric_error = _metric_score(metric, example, pred)
-            timing["metric_seconds"] = time.perf_counter() - metric_started_at
+                # Prediction arrived from a batch call; attempt-level timing
+                # belongs to the batch, not the example.
+                pred_error = None
+                timing["prediction_attempts"] = 1
+                timing["prediction_succeeded"] = True
 
-            row_build_started_at = time.perf_counter()
+            if timing_logs:
+                metric_started_at = perf_counter()
+            score, metric_error = _metric_score(metric, example, pred)
+            if timing_logs:
+                timing["metric_seconds"] = perf_counter() - metric_started_at
+                row_build_started_at = perf_counter()
+            # Raw objects go straight into the row; the default hook
+            # unwraps them during encoding, keeping traversal in C.
             row: dict[str, Any] = {
-                "example": _to_jsonable(example),
-                "prediction": _to_jsonable(pred),
+                "example": example,
+                "prediction": pred,
                 "score": score,
             }
 
@@ -218,14 +556,23 @@ def _run_eval(
                     "prediction_error": pred_error,
                     "metric_error": metric_error,
                 }
-            timing["row_build_seconds"] = time.perf_counter() - row_build_started_at
+            # Encoding in the worker overlaps serialization with the next
+            # example's prediction; the writer only ships finished bytes.
+            encoded_row = (
+                orjson.dumps(row, default=_orjson_default, option=_ORJSON_OPTS) + _NEWLINE
+            )
+            if timing_logs:
+                timing["row_build_seconds"] = (
+                    perf_counter() - row_build_started_at
+                )
         except Exception as exc:
             score = 0.0
             has_error = True
-            row_build_started_at = time.perf_counter()
+            if timing_logs:
+                row_build_started_at = perf_counter()
             row = {
-                "example": _to_jsonable(example),
-                "prediction": _to_jsonable(fallback_prediction_factory()),
+                "example": example,
+                "prediction": fallback_prediction_factory(),
                 "score": score,
                 "error": {
                     "prediction_error": (
@@ -235,22 +582,18 @@ def _run_eval(
                     "metric_error": None,
                 },
             }
-            timing["row_build_seconds"] = time.perf_counter() - row_build_started_at
+            encoded_row = (
+                orjson.dumps(row, default=_orjson_default, option=_ORJSON_OPTS) + _NEWLINE
+            )
+            if timing_logs:
+                timing["row_build_seconds"] = (
+                    perf_counter() - row_build_started_at
+                )
 
-        completed_at = time.perf_counter()
+        completed_at = perf_counter()
         elapsed = completed_at - started_at
         timing["total_seconds"] = elapsed
-        return idx0, row, score, has_error, elapsed, timing, completed_at
-
-    def should_log_timing(example_idx: int, total_seconds: float) -> bool:
-        if not timing_logs:
-            return False
-        if (
-            timing_slow_threshold_seconds is not None
-            and total_seconds >= timing_slow_threshold_seconds
-        ):
-            return True
-        return (example_idx % timing_log_every) == 0
+        return idx0, encoded_row, score, has_error, elapsed, timing, completed_at
 
     timing_totals = {
         "total_seconds": 0.0,
@@ -265,223 +608,369 @@ def _run_eval(
     timing_prediction_attempts = 0.0
     timing_examples_count = 0
     timing_slow_count = 0
+    timing_slowest: list[tuple[float, int]] = []
 
     start_idx = 0
+    ends_with_newline = True
     if resume:
-        existing_rows = _load_existing_rows(out_file)
-        start_idx = len(existing_rows)
+        # The cursor sidecar, when fresh, answers resume in one small read;
+        # checkpointed rows always end on a flushed newline.
+        cursor = _read_cursor(out_file)
+        if cursor is not None:
+            start_idx, score_sum, error_count = cursor
+        else:
+            start_idx, score_sum, error_count, ends_with_newline = (
+                _scan_existing_rows(out_file)
+            )
         if start_idx > total:
             raise ValueError(
                 "Existing eval file has more rows than the current test set: "
                 f"{start_idx} > {total} ({out_file})"
             )
 
-        for row in existing_rows:
-            try:
-                scores.append(float(row.get("score", 0.0)))
-            except (TypeError, ValueError):
-                scores.append(0.0)
-            if row.get("error") is not None:
-                error_count += 1
-
         if start_idx:
             print(f"Resuming from {start_idx}/{total} completed examples in {out_file}")
     elif out_path.exists():
         print(f"Overwrite enabled; replacing existing results file: {out_file}")
+        _cursor_path(out_file).unlink(missing_ok=True)
+
+    # Streaming iterables cannot be swept without consuming them, so the
+    # pre-flight check only runs for indexable testsets.
+    if validate and start_idx < total and hasattr(testset, "__getitem__"):
+        _validate_examples(
+            testset, start_idx, total, metric, fallback_prediction_factory
+        )
 
     if start_idx == total:
         print("All examples are already evaluated. Skipping prediction loop.")
     else:
         out_path.parent.mkdir(parents=True, exist_ok=True)
         mode = "a" if resume and start_idx > 0 else "w"
-        with out_path.open(mode, encoding="utf-8") as f:
-            if mode == "a" and out_path.stat().st_size > 0:
-                with out_path.open("rb") as check_f:
-                    check_f.seek(-1, 2)
-                    if check_f.read(1) != b"\n":
-                        f.write("\n")
-
-            pending = list(enumerate(testset[start_idx:], start=start_idx))
-            if effective_num_threads == 1:
-                for idx0, example in pending:
-                    (
-                        _,
-                        row,
-                        score,
-                        has_error,
-                        elapsed,
-                        timing,
-                        completed_at,
-                    ) = process_example(idx0, example)
-                    scores.append(score)
-                    if has_error:
-                        error_count += 1
-
-                    idx = idx0 + 1
-                    queue_wait_seconds = max(0.0, time.perf_counter() - completed_at)
-                    write_started_at = time.perf_counter()
-                    f.write(json.dumps(row, ensure_ascii=False))
-                    f.write("\n")
-                    f.flush()
-                    write_seconds = time.perf_counter() - write_started_at
-                    print(
-                        f"Processed {idx}/{total} examples in {elapsed:.2f}s "
-                        f"(score={score:.4f})"
-                    )
+        with contextlib.ExitStack() as stack:
+            # Rows stay in the 1 MiB userspace buffer between flushes; the
+            # flush_every policy bounds how many rows a crash can lose while
+            # keeping the common path free of per-row write syscalls.
+            f = stack.enter_context(out_path.open(mode + "b", buffering=1 << 20))
+            # Per-example timing rows go to an NDJSON sidecar instead of stdout
+            # so the hot path never serializes workers on print contention.
+            timing_f = (
+                stack.enter_context(timing_sidecar_path(out_file).open(mode + "b"))
+                if timing_logs
+                else None
+            )
 
-                    timing_examples_count += 1
-                    timing_totals["total_seconds"] += timing.get("total_seconds", elapsed)
-                    timing_totals["inputs_seconds"] += timing.get("inputs_seconds", 0.0)
-                    timing_totals["prediction_seconds"] += timing.get(
-                        "prediction_seconds", 0.0
-                    )
-                    timing_totals["metric_seconds"] += timing.get("metric_seconds", 0.0)
-                    timing_totals["row_build_seconds"] += timing.get(
-                        "row_build_seconds", 0.0
-                    )
-                    timing_totals["write_seconds"] += write_seconds
-                    timing_totals["queue_wait_seconds"] += queue_wait_seconds
-                    timing_totals["prediction_backoff_seconds"] += timing.get(
-                        "prediction_backoff_seconds", 0.0
-                    )
-                    timing_prediction_attempts += float(
-                        timing.get("prediction_attempts", 0.0)
+            def record_timing(
+                idx: int,
+                elapsed: float,
+                timing: dict[str, Any],
+                write_seconds: float,
+                queue_wait_seconds: float,
+            ) -> None:
+                nonlocal timing_examples_count, timing_prediction_attempts
+                nonlocal timing_slow_count
+
+                timing_examples_count += 1
+                timing_totals["total_seconds"] += timing.get("total_seconds", elapsed)
+                for key in (
+                    "inputs_seconds",
+                    "prediction_seconds",
+                    "metric_seconds",
+                    "row_build_seconds",
+                    "prediction_backoff_seconds",
+                ):
+                    timing_totals[key] += timing.get(key, 0.0)
+                timing_totals["write_seconds"] += write_seconds
+                timing_totals["queue_wait_seconds"] += queue_wait_seconds
+                timing_prediction_attempts += float(
+                    timing.get("prediction_attempts", 0.0)
+                )
+
+                is_slow = (
+                    timing_slow_threshold_seconds is not None
+                    and elapsed >= timing_slow_threshold_seconds
+                )
+                if is_slow:
+                    timing_slow_count += 1
+
+                if timing_f is None:
+                    return
+                timing_slowest.append((elapsed, idx))
+                if is_slow or (idx % timing_log_every) == 0:
+                    timing_row = {
+                        "idx": idx,
+                        "queue_wait_seconds": queue_wait_seconds,
+                        "write_seconds": write_seconds,
+                        **timing,
+                    }
+                    timing_f.write(
+                        orjson.dumps(timing_row, default=_orjson_default, option=_ORJSON_OPTS)
                     )
-                    if (
-                        timing_slow_threshold_seconds is not None
-                        and elapsed >= timing_slow_threshold_seconds
-                    ):
-                        timing_slow_count += 1
-
-                    if should_log_timing(idx, elapsed):
-                        attempt_durations = timing.get(
-                            "prediction_attempt_durations", []
-                        )
-                        attempts_fmt = ", ".join(
-                            f"{duration:.2f}s" for duration in attempt_durations
+                    timing_f.write(_NEWLINE)
+
+            # The resume scan already saw the file's last byte; repair a
+            # missing trailing newline without re-opening the file.
+            if mode == "a" and not ends_with_newline:
+                f.write(_NEWLINE)
+
+            # A dedicated writer thread drains encoded rows so disk latency
+            # (notably on networked HPC filesystems) overlaps with the next
+            # prediction instead of blocking the dispatch loop; the bounded
+            # queue applies backpressure if the disk falls far behind. After
+            # a write failure the thread keeps draining so producers never
+            # block on a full queue; the error is re-raised once the run
+            # winds down.
+            write_queue: queue.Queue[tuple[bytes, float, bool] | None] = (
+                queue.Queue(maxsize=64)
+            )
+            base_offset = (
+                0
+                if mode == "w"
+                else out_path.stat().st_size + (0 if ends_with_newline else 1)
+            )
+
+            def writer_loop() -> None:
+                get = write_queue.get
+                write = f.write
+                rows_written = 0
+                byte_offset = base_offset
+                cursor_next_idx = start_idx
+                cursor_score_sum = score_sum
+                cursor_error_count = error_count
+                while True:
+                    item = get()
+                    if item is None:
+                        break
+                    if writer_error:
+                        continue
+                    chunk, row_score, row_has_error = item
+                    try:
+                        write(chunk)
+                        byte_offset += len(chunk)
+                        cursor_next_idx += 1
+                        cursor_score_sum += row_score
+                        if row_has_error:
+                            cursor_error_count += 1
+                        rows_written += 1
+                        if rows_written % flush_every == 0:
+                            f.flush()
+                            _write_cursor(
+                                out_file,
+                                cursor_next_idx,
+                                cursor_score_sum,
+                                cursor_error_count,
+                                byte_offset,
+                            )
+                    except Exception as exc:
+                        writer_error.append(exc)
+                if rows_written and not writer_error:
+                    try:
+                        f.flush()
+                        _write_cursor(
+                            out_file,
+                            cursor_next_idx,
+                            cursor_score_sum,
+                            cursor_error_count,
+                            byte_offset,
                         )
-                        print(
-                            "[timing] "
-                            f"{idx}/{total}: total={elapsed:.2f}s "
-                            f"inputs={timing.get('inputs_seconds', 0.0):.2f}s "
-                            f"predict={timing.get('prediction_seconds', 0.0):.2f}s "
-                            f"metric={timing.get('metric_seconds', 0.0):.2f}s "
-                            f"row_build={timing.get('row_build_seconds', 0.0):.2f}s "
-                            f"queue_wait={queue_wait_seconds:.2f}s "
-                            f"write_flush={write_seconds:.2f}s "
-                            f"attempts={timing.get('prediction_attempts', 0)} "
-                            f"attempt_durations=[{attempts_fmt}] "
-                            f"backoff_sleep={timing.get('prediction_backoff_seconds', 0.0):.2f}s "
-                            f"prediction_ok={timing.get('prediction_succeeded', False)}"
+                    except Exception as exc:
+                        writer_error.append(exc)
+
+            writer = threading.Thread(
+                target=writer_loop, name="eval-row-writer", daemon=True
+            )
+            writer.start()
+            # LIFO callbacks: the sentinel lands before the join, and both
+            # run before the ExitStack closes the file.
+            stack.callback(writer.join)
+            stack.callback(write_queue.put, None)
+
+            # Progress messages batch up and flush on the same cadence as
+            # the results file; per-example print() calls serialize workers
+            # on stdout under high thread counts.
+            progress_lines: list[str] = []
+
+            def flush_progress() -> None:
+                if progress_lines:
+                    sys.stdout.write("\n".join(progress_lines) + "\n")
+                    progress_lines.clear()
+
+            def log_progress(message: str) -> None:
+                progress_lines.append(message)
+                if len(progress_lines) >= flush_every:
+                    flush_progress()
+
+            # Lazy triples instead of materializing a copy of the remaining
+            # test set; input extraction happens here, on the submitting
+            # side, so worker threads never repeat it under the GIL. A plain
+            # iterable streams through islice, so datasets never need to fit
+            # in memory at once.
+            if hasattr(testset, "__getitem__"):
+                example_iter = (testset[i] for i in range(start_idx, total))
+            else:
+                example_iter = islice(iter(testset), start_idx, total)
+            pending = (
+                (i, ex, _build_inputs(ex))
+                for i, ex in enumerate(example_iter, start=start_idx)
+            )
+
+            def emit_row(
+                idx0: int,
+                encoded_row: bytes,
+                score: float,
+                has_error: bool,
+                elapsed: float,
+                timing: dict[str, Any],
+                completed_at: float,
+            ) -> None:
+                nonlocal error_count, score_sum
+
+                score_sum += score
+                if has_error:
+                    error_count += 1
+
+                idx = idx0 + 1
+                queue_wait_seconds = max(0.0, time.perf_counter() - completed_at)
+                write_started_at = time.perf_counter()
+                write_queue.put((encoded_row, score, has_error))
+                write_seconds = time.perf_counter() - write_started_at
+                log_progress(
+                    f"Processed {idx}/{total} examples in {elapsed:.2f}s "
+                    f"(score={score:.4f})"
+                )
+                record_timing(
+                    idx, elapsed, timing, write_seconds, queue_wait_seconds
+                )
+
+            if batch_size is not None:
+                print(f"Running evaluation in batches of {batch_size}.")
+                pending_iter = iter(pending)
+                while True:
+                    chunk = list(islice(pending_iter, batch_size))
+                    if not chunk:
+                        break
+                    try:
+                        preds = predictor.batch(
+                            [example for _, example, _ in chunk],
+                            num_threads=effective_num_threads,
                         )
+                    except Exception:
+                        # Whole-batch failure: recover example by example
+                        # through the usual retry path.
+                        preds = [None] * len(chunk)
+                    for (idx0, example, inputs), pred in zip(chunk, preds):
+                        # A None slot means that example's request failed in
+                        # the batch; process_example retries it individually.
+                        emit_row(*process_example(idx0, example, inputs, pred))
+            elif effective_num_threads == 1:
+                for idx0, example, inputs in pending:
+                    emit_row(*process_example(idx0, example, inputs))
             else:
-                print(f"Running evaluation with {effective_num_threads} threads.")
                 next_to_write = start_idx
-                buffered_results: dict[
-                    int, tuple[dict[str, Any], float, bool, float, dict[str, Any], float]
-                ] = {}
+                # Min-heap of out-of-order completions keyed by example index;
+                # indices are unique, so heap ordering never compares the
+                # payloads. Bounded submission caps its size at the in-flight
+                # limit even when one slow example stalls the drain.
+                completed_heap: list[
+                    tuple[
+                        int,
+                        tuple[bytes, float, bool, float, dict[str, Any], float],
+                    ]
+                ] = []
+
+                def write_completed(
+                    idx0: int,
+                    result: tuple[bytes, float, bool, float, dict[str, Any], float],
+                ) -> None:
+                    nonlocal next_to_write
+
+                    heapq.heappush(completed_heap, (idx0, result))
+                    while completed_heap and completed_heap[0][0] == next_to_write:
+                        emit_row(
+                            next_to_write, *heapq.heappop(completed_heap)[1]
+                        )
+                        next_to_write += 1
 
                 with concurrent.futures.ThreadPoolExecutor(
                     max_workers=effective_num_threads
                 ) as executor:
-                    futures = [
-                        executor.submit(process_example, idx0, example)
-                        for idx0, example in pending
-                    ]
-                    for future in concurrent.futures.as_completed(futures):
-                        idx0, row, score, has_error, elapsed, timing, completed_at = (
-                            future.result()
-                        )
-                        buffered_results[idx0] = (
-                            row,
-                            score,
-                            has_error,
-                            elapsed,
-                            timing,
-                            completed_at,
+                    if backend == "async":
+                        print(
+                            "Running evaluation with asyncio over "
+                            f"{effective_num_threads} workers."
                         )
 
-                        while next_to_write in buffered_results:
-                            (
-                                next_row,
-                                next_score,
-                                next_has_error,
-                                next_elapsed,
-                                next_timing,
-                                next_completed_at,
-                            ) = buffered_results.pop(next_to_write)
-                            scores.append(next_score)
-                            if next_has_error:
-                                error_count += 1
-
-                            idx = next_to_write + 1
-                            queue_wait_seconds = max(
-                                0.0, time.perf_counter() - next_completed_at
-                            )
-                            write_started_at = time.perf_counter()
-                            f.write(json.dumps(next_row, ensure_ascii=False))
-                            f.write("\n")
-                            f.flush()
-                            write_seconds = time.perf_counter() - write_started_at
-                            print(
-                                f"Processed {idx}/{total} examples in {next_elapsed:.2f}s "
-                                f"(score={next_score:.4f})"
-                            )
+                        async def run_async() -> None:
+                            loop = asyncio.get_running_loop()
+                            # The semaphore caps in-flight predictor calls so
+                            # the event loop never queues more work than the
+                            # pool can serve.
+                            semaphore = asyncio.Semaphore(effective_num_threads)
 
-                            timing_examples_count += 1
-                            timing_totals["total_seconds"] += next_timing.get(
-                                "total_seconds", next_elapsed
-                            )
-                            timing_totals["inputs_seconds"] += next_timing.get(
-                                "inputs_seconds", 0.0
-                            )
-                            timing_totals["prediction_seconds"] += next_timing.get(
-                                "prediction_seconds", 0.0
-                            )
-                            timing_totals["metric_seconds"] += next_timing.get(
-                                "metric_seconds", 0.0
-                            )
-                            timing_totals["row_build_seconds"] += next_timing.get(
-                                "row_build_seconds", 0.0
-                            )
-                            timing_totals["write_seconds"] += write_seconds
-                            timing_totals["queue_wait_seconds"] += queue_wait_seconds
-                            timing_totals["prediction_backoff_seconds"] += next_timing.get(
-                                "prediction_backoff_seconds", 0.0
-                            )
-                            timing_prediction_attempts += float(
-                                next_timing.get("prediction_attempts", 0.0)
-                            )
-                            if (
-                                timing_slow_threshold_seconds is not None
-                                and next_elapsed >= timing_slow_threshold_seconds
+                            async def run_one(
+                                idx0: int, example: Any, inputs: dict[str, Any]
                             ):
-                                timing_slow_count += 1
+                                async with semaphore:
+                                    return await loop.run_in_executor(
+                                        executor,
+                                        process_example,
+                                        idx0,
+                                        example,
+                                        inputs,
+                                    )
 
-                            if should_log_timing(idx, next_elapsed):
-                                attempt_durations = next_timing.get(
-                                    "prediction_attempt_durations", []
-                                )
-                                attempts_fmt = ", ".join(
-                                    f"{duration:.2f}s" for duration in attempt_durations
+                            tasks = [
+                                asyncio.ensure_future(run_one(idx0, example, inputs))
+                                for idx0, example, inputs in pending
+                            ]
+                            for task in asyncio.as_completed(tasks):
+                                idx0, *rest = await task
+                                write_completed(idx0, tuple(rest))
+
+                        asyncio.run(run_async())
+                    else:
+                        print(
+                            f"Running evaluation with {effective_num_threads} threads."
+                        )
+                        # Bounded submission: cap in-flight futures at 2x the
+                        # worker count so neither the future list nor the
+                        # ordered-write buffer grows with the test set.
+                        max_in_flight = effective_num_threads * 2
+                        in_flight: set[concurrent.futures.Future] = set()
+                        for idx0, example, inputs in pending:
+                            if len(in_flight) >= max_in_flight:
+                                done, in_flight = concurrent.futures.wait(
+                                    in_flight,
+                                    return_when=concurrent.futures.FIRST_COMPLETED,
                                 )
-                                print(
-                                    "[timing] "
-                                    f"{idx}/{total}: total={next_elapsed:.2f}s "
-                                    f"inputs={next_timing.get('inputs_seconds', 0.0):.2f}s "
-                                    f"predict={next_timing.get('prediction_seconds', 0.0):.2f}s "
-                                    f"metric={next_timing.get('metric_seconds', 0.0):.2f}s "
-                                    f"row_build={next_timing.get('row_build_seconds', 0.0):.2f}s "
-                                    f"queue_wait={queue_wait_seconds:.2f}s "
-                                    f"write_flush={write_seconds:.2f}s "
-                                    f"attempts={next_timing.get('prediction_attempts', 0)} "
-                                    f"attempt_durations=[{attempts_fmt}] "
-                                    f"backoff_sleep={next_timing.get('prediction_backoff_seconds', 0.0):.2f}s "
-                                    f"prediction_ok={next_timing.get('prediction_succeeded', False)}"
+                                for future in done:
+                                    done_idx0, *rest = future.result()
+                                    write_completed(done_idx0, tuple(rest))
+                            in_flight.add(
+                                executor.submit(
+                                    process_example, idx0, example, inputs
                                 )
-                            next_to_write += 1
+                            )
+                        for future in concurrent.futures.as_completed(in_flight):
+                            done_idx0, *rest = future.result()
+                            write_completed(done_idx0, tuple(rest))
+
+            flush_progress()
+
+    if writer_error:
+        raise writer_error[0]
 
     if timing_logs and timing_examples_count:
+        overhead_seconds = _perf_counter_overhead_seconds()
+        print(
+            "[timing-calibration] "
+            f"overhead_per_pair_ns={overhead_seconds * 1e9:.1f} "
+            "(subtracted from inputs/metric/row_build sums)"
+        )
+        # One perf_counter pair contributed per example to each sub-phase sum.
+        pair_overhead = timing_examples_count * overhead_seconds
+        for key in ("inputs_seconds", "metric_seconds", "row_build_seconds"):
+            timing_totals[key] = max(0.0, timing_totals[key] - pair_overhead)
+
         avg_total = timing_totals["total_seconds"] / timing_examples_count
         avg_inputs = timing_totals["inputs_seconds"] / timing_examples_count
         avg_prediction = timing_totals["prediction_seconds"] / timing_examples_count
@@ -511,9 +1000,19 @@ def _run_eval(
                 f"slow_examples(>={timing_slow_threshold_seconds:.2f}s)="
                 f"{timing_slow_count}/{timing_examples_count}"
             )
+        if timing_slowest:
+            slowest = sorted(timing_slowest, reverse=True)[:_TIMING_SLOWEST_TOP_K]
+            print(
+                "[timing-summary] slowest examples: "
+                + ", ".join(f"#{idx}={elapsed:.2f}s" for elapsed, idx in slowest)
+            )
+            print(
+                "[timing-summary] per-example rows written to "
+                f"{timing_sidecar_path(out_file)}"
+            )
 
-    avg = (sum(scores) / total) if total else 0.0
-    print(f"Average Metric: {sum(scores):.6f} / {total} ({avg * 100:.1f}%)")
+    avg = (score_sum / total) if total else 0.0
+    print(f"Average Metric: {score_sum:.6f} / {total} ({avg * 100:.1f}%)")
     if error_count:
         print(
             "Completed with "
@@ -525,13 +1024,18 @@ def _run_eval(
 
 def evaluate_checklist(
     predictor: Any,
-    testset: list[Any],
+    testset: Sequence[Any] | Iterable[Any],
     out_file: str,
     *,
+    total: int | None = None,
     max_retries: int = _DEFAULT_MAX_RETRIES,
     retry_delay_seconds: float = _DEFAULT_RETRY_DELAY_SECONDS,
     resume: bool = True,
+    validate: bool = True,
     num_threads: int | None = None,
+    backend: str = "thread",
+    batch_size: int | None = None,
+    flush_every: int = _DEFAULT_FLUSH_EVERY,
     timing_logs: bool = False,
     timing_log_every: int = 1,
     timing_slow_threshold_seconds: float | None = None,
@@ -540,12 +1044,17 @@ def evaluate_checklist(
         predictor,
         testset,
         out_file,
+        total=total,
         metric=multilabel_f1_with_feedback,
         fallback_prediction_factory=lambda: dspy.Prediction(labels=[]),
         max_retries=max_retries,
         retry_delay_seconds=retry_delay_seconds,
         resume=resume,
+        validate=validate,
         num_threads=num_threads,
+        backend=backend,
+        batch_size=batch_size,
+        flush_every=flush_every,
         timing_logs=timing_logs,
         timing_log_every=timing_log_every,
         timing_slow_threshold_seconds=timing_slow_threshold_seconds,
@@ -554,13 +1063,18 @@ def evaluate_checklist(
 
 def evaluate_sbar(
     predictor: Any,
-    testset: list[Any],
+    testset: Sequence[Any] | Iterable[Any],
     out_file: str,
     *,
+    total: int | None = None,
     max_retries: int = _DEFAULT_MAX_RETRIES,
     retry_delay_seconds: float = _DEFAULT_RETRY_DELAY_SECONDS,
     resume: bool = True,
+    validate: bool = True,
     num_threads: int | None = None,
+    backend: str = "thread",
+    batch_size: int | None = None,
+    flush_every: int = _DEFAULT_FLUSH_EVERY,
     timing_logs: bool = False,
     timing_log_every: int = 1,
     timing_slow_threshold_seconds: float | None = None,
@@ -569,12 +1083,17 @@ def evaluate_sbar(
         predictor,
         testset,
         out_file,
+        total=total,
         metric=gepa_span_metric,
         fallback_prediction_factory=lambda: dspy.Prediction(pred_spans=[]),
         max_retries=max_retries,
         retry_delay_seconds=retry_delay_seconds,
         resume=resume,
+        validate=validate,
         num_threads=num_threads,
+        backend=backend,
+        batch_size=batch_size,
+        flush_every=flush_every,
         timing_logs=timing_logs,
         timing_log_every=timing_log_every,
         timing_slow_threshold_seconds=timing_slow_threshold_seconds,
@@ -583,13 +1102,18 @@ def evaluate_sbar(
 
 def evaluate(
     predictor: Any,
-    testset: list[Any],
+    testset: Sequence[Any] | Iterable[Any],
     out_file: str,
     *,
+    total: int | None = None,
     max_retries: int = _DEFAULT_MAX_RETRIES,
     retry_delay_seconds: float = _DEFAULT_RETRY_DELAY_SECONDS,
     resume: bool = True,
+    validate: bool = True,
     num_threads: int | None = None,
+    backend: str = "thread",
+    batch_size: int | None = None,
+    flush_every: int = _DEFAULT_FLUSH_EVERY,
     timing_logs: bool = False,
     timing_log_every: int = 1,
     timing_slow_threshold_seconds: float | None = None,
@@ -599,10 +1123,15 @@ def evaluate(
         predictor,
         testset,
         out_file,
+        total=total,
         max_retries=max_retries,
         retry_delay_seconds=retry_delay_seconds,
         resume=resume,
+        validate=validate,
         num_threads=num_threads,
+        backend=backend,
+        batch_size=batch_size,
+        flush_every=flush_every,
         timing_logs=timing_logs,
         timing_log_every=timing_log_every,
         timing_slow_threshold_seconds=timing_slow_threshold_seconds,
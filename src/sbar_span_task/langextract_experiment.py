@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import dataclasses
+import functools
+import hashlib
 import json
+import os
+import operator
 import random
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import srsly
 from span_metric.soft_f1 import label_aware_soft_f1
@@ -32,12 +37,37 @@ DEFAULT_PROMPT_DESCRIPTION = (
 )
 
 
+BATCH_PROMPT_SUFFIX = (
+    """
+    The input contains several independent transcripts, each introduced by a marker line such as "=== DOC 2 ===".
+    - Treat every transcript as a separate handover; never combine quotes across transcripts.
+    - For every extraction, set the attribute "doc_id" to the integer from the marker line of the transcript the quote came from.
+    """
+)
+
+
+def _composite_batch_text(records: list[SbarRecord]) -> str:
+    return "\n\n".join(
+        f"=== DOC {doc_id} ===\n{record.text}"
+        for doc_id, record in enumerate(records, start=1)
+    )
+
+
 @dataclasses.dataclass(frozen=True)
 class SbarItem:
     label: str
     quote: str
 
 
+# Internal accumulators work on (label, quote) tuples -- the same key the
+# dedup sets hash anyway -- and only materialize SbarItem at API boundaries.
+_ITEM_KEY = operator.attrgetter("label", "quote")
+
+
+def _as_sbar_items(pairs: list[tuple[str, str]]) -> list[SbarItem]:
+    return [SbarItem(label=label, quote=quote) for label, quote in pairs]
+
+
 @dataclasses.dataclass(frozen=True)
 class SbarRecord:
     text: str
@@ -46,47 +76,38 @@ class SbarRecord:
     annotator_id: str | None
 
 
+_SPAN_SORT_KEY = operator.itemgetter("start", "end")
+
+
 def _valid_gold_spans_from_text_and_spans(
     text: str, raw_spans: list[dict[str, Any]] | None
 ) -> list[dict[str, Any]]:
     """Return valid SBAR gold spans with explicit char boundaries."""
-    spans = raw_spans or []
+    if not raw_spans:
+        return []
     text_len = len(text)
-    valid_gold_spans: list[dict[str, Any]] = []
-
-    for span in spans:
-        if not isinstance(span, dict):
-            continue
-        label = span.get("label")
-        start = span.get("start")
-        end = span.get("end")
-
-        if label not in SBAR_ALLOWED_LABELS:
-            continue
-        if not isinstance(start, int) or not isinstance(end, int):
-            continue
-        if start < 0 or end <= start or end > text_len:
-            continue
-
-        valid_gold_spans.append(
-            {
-                "start": start,
-                "end": end,
-                "label": str(label),
-            }
-        )
-
-    valid_gold_spans.sort(key=lambda span: (span["start"], span["end"]))
+    allowed = SBAR_ALLOWED_LABELS
+    # Exact-type checks: rows come straight from JSON, so spans are plain
+    # dicts and offsets plain ints (this also keeps bools out, which
+    # isinstance(..., int) would let through).
+    valid_gold_spans = [
+        {"start": start, "end": end, "label": span["label"]}
+        for span in raw_spans
+        if type(span) is dict
+        and span.get("label") in allowed
+        and type(start := span.get("start")) is int
+        and type(end := span.get("end")) is int
+        and 0 <= start < end <= text_len
+    ]
+    valid_gold_spans.sort(key=_SPAN_SORT_KEY)
     return valid_gold_spans
 
 
-def _span_items_from_gold_spans(
-    text: str, raw_spans: list[dict[str, Any]] | None
+def _span_items_from_valid_spans(
+    text: str, valid_spans: list[dict[str, Any]]
 ) -> list[SbarItem]:
-    """Return de-duplicated SBAR label/quote items from raw spans."""
-    valid_spans = _valid_gold_spans_from_text_and_spans(text=text, raw_spans=raw_spans)
-
-    items: list[SbarItem] = []
+    """Quote-slice and de-duplicate spans that are already validated."""
+    pairs: list[tuple[str, str]] = []
     seen: set[tuple[str, str]] = set()
 
     for span in valid_spans:
@@ -98,9 +119,18 @@ def _span_items_from_gold_spans(
         if key in seen:
             continue
         seen.add(key)
-        items.append(SbarItem(label=span["label"], quote=quote))
+        pairs.append(key)
 
-    return items
+    return _as_sbar_items(pairs)
+
+
+def _span_items_from_gold_spans(
+    text: str, raw_spans: list[dict[str, Any]] | None
+) -> list[SbarItem]:
+    """Return de-duplicated SBAR label/quote items from raw spans."""
+    return _span_items_from_valid_spans(
+        text, _valid_gold_spans_from_text_and_spans(text=text, raw_spans=raw_spans)
+    )
 
 
 def span_items_from_record(record: dict[str, Any]) -> list[SbarItem]:
@@ -111,8 +141,10 @@ def span_items_from_record(record: dict[str, Any]) -> list[SbarItem]:
     )
 
 
-def load_sbar_records(path: str, annotator_id: str | None = None) -> list[SbarRecord]:
-    records: list[SbarRecord] = []
+def iter_sbar_records(
+    path: str, annotator_id: str | None = None
+) -> Iterator[SbarRecord]:
+    """Stream valid SBAR records one row at a time (srsly reads lazily)."""
     for row in srsly.read_jsonl(path):
         if not isinstance(row, dict):
             continue
@@ -129,26 +161,27 @@ def load_sbar_records(path: str, annotator_id: str | None = None) -> list[SbarRe
         )
         if not gold_spans:
             continue
-        items = _span_items_from_gold_spans(text=text, raw_spans=gold_spans)
+        # gold_spans already passed validation; slice and dedup directly.
+        items = _span_items_from_valid_spans(text, gold_spans)
         if not items:
             continue
 
-        records.append(
-            SbarRecord(
-                text=text,
-                items=items,
-                gold_spans=gold_spans,
-                annotator_id=row.get("_annotator_id"),
-            )
+        yield SbarRecord(
+            text=text,
+            items=items,
+            gold_spans=gold_spans,
+            annotator_id=row.get("_annotator_id"),
         )
 
-    return records
+
+def load_sbar_records(path: str, annotator_id: str | None = None) -> list[SbarRecord]:
+    return list(iter_sbar_records(path, annotator_id=annotator_id))
 
 
 def exact_match_metrics(gold_items: list[SbarItem], pred_items: list[SbarItem]) -> dict[str, float]:
     """Compute exact-match precision/recall/f1 over (label, quote)."""
-    gold_set = {(item.label, item.quote) for item in gold_items}
-    pred_set = {(item.label, item.quote) for item in pred_items}
+    gold_set = set(map(_ITEM_KEY, gold_items))
+    pred_set = set(map(_ITEM_KEY, pred_items))
 
     tp = len(gold_set & pred_set)
     precision = tp / len(pred_set) if pred_set else 0.0
@@ -174,30 +207,86 @@ def _require_langextract() -> Any:
     return lx
 
 
-def _to_langextract_example(lx: Any, record: SbarRecord) -> Any:
+@functools.lru_cache(maxsize=256)
+def _build_langextract_example(
+    lx: Any, text: str, item_pairs: tuple[tuple[str, str], ...]
+) -> Any:
     return lx.data.ExampleData(
-        text=record.text,
+        text=text,
         extractions=[
             lx.data.Extraction(
-                extraction_text=item.quote,
-                extraction_class=item.label,
+                extraction_text=quote,
+                extraction_class=label,
                 attributes={},
             )
-            for item in record.items
+            for label, quote in item_pairs
         ],
     )
 
 
-def _extract_items_from_prediction(prediction: Any) -> list[SbarItem]:
+def _to_langextract_example(lx: Any, record: SbarRecord) -> Any:
+    # Memoized on record content: repeated experiment runs in one process
+    # (model or prompt sweeps over the same training pool) reuse the built
+    # ExampleData instead of reallocating every Extraction.
+    return _build_langextract_example(
+        lx, record.text, tuple(map(_ITEM_KEY, record.items))
+    )
+
+
+def _dict_extraction_fields(extractions: Any) -> Iterator[tuple[Any, Any, Any]]:
+    for extraction in extractions:
+        if not isinstance(extraction, dict):
+            yield (
+                getattr(extraction, "extraction_class", None)
+                or getattr(extraction, "label", None),
+                getattr(extraction, "extraction_text", None)
+                or getattr(extraction, "quote", None)
+                or getattr(extraction, "text", None),
+                getattr(extraction, "attributes", None) or {},
+            )
+            continue
+        yield (
+            extraction.get("extraction_class") or extraction.get("label"),
+            extraction.get("extraction_text")
+            or extraction.get("quote")
+            or extraction.get("text"),
+            extraction.get("attributes") or {},
+        )
+
+
+def _object_extraction_fields(extractions: Any) -> Iterator[tuple[Any, Any, Any]]:
+    for extraction in extractions:
+        # Mixed dict/object lists exist in the wild (e.g. partially parsed
+        # responses); getattr on a dict would yield None and silently drop
+        # the item, so keep a per-item dict check on this fallback path.
+        if isinstance(extraction, dict):
+            yield (
+                extraction.get("extraction_class") or extraction.get("label"),
+                extraction.get("extraction_text")
+                or extraction.get("quote")
+                or extraction.get("text"),
+                extraction.get("attributes") or {},
+            )
+            continue
+        yield (
+            getattr(extraction, "extraction_class", None)
+            or getattr(extraction, "label", None),
+            getattr(extraction, "extraction_text", None)
+            or getattr(extraction, "quote", None)
+            or getattr(extraction, "text", None),
+            getattr(extraction, "attributes", None) or {},
+        )
+
+
+def _iter_prediction_fields(prediction: Any) -> Iterator[tuple[str, str, Any]]:
+    """Yield (label, quote, attributes) for every valid extraction."""
     docs: list[Any]
     if isinstance(prediction, list):
         docs = prediction
     else:
         docs = [prediction]
 
-    items: list[SbarItem] = []
-    seen: set[tuple[str, str]] = set()
-
+    allowed = SBAR_ALLOWED_LABELS
     for doc in docs:
         if isinstance(doc, dict):
             extractions = doc.get("extractions")
@@ -206,42 +295,82 @@ def _extract_items_from_prediction(prediction: Any) -> list[SbarItem]:
 
         if extractions is None:
             extractions = [doc]
+        elif not isinstance(extractions, (list, tuple)):
+            # Generators and other iterables can't be probed below (and a
+            # generator would be consumed by the probe), so materialize them.
+            extractions = list(extractions)
+
+        # Extraction shape is usually homogeneous within one document, so
+        # pick the field reader once per doc; each reader falls back per
+        # item for the other shape, so a wrong guess degrades, never drops.
+        first = extractions[0] if extractions else None
+        if isinstance(first, dict):
+            fields = _dict_extraction_fields(extractions)
+        else:
+            fields = _object_extraction_fields(extractions)
 
-        for extraction in extractions:
-            if isinstance(extraction, dict):
-                label = extraction.get("extraction_class") or extraction.get("label")
-                quote = (
-                    extraction.get("extraction_text")
-                    or extraction.get("quote")
-                    or extraction.get("text")
-                )
-                attrs = extraction.get("attributes") or {}
-            else:
-                label = getattr(extraction, "extraction_class", None) or getattr(
-                    extraction, "label", None
-                )
-                quote = (
-                    getattr(extraction, "extraction_text", None)
-                    or getattr(extraction, "quote", None)
-                    or getattr(extraction, "text", None)
-                )
-                attrs = getattr(extraction, "attributes", None) or {}
-
+        for label, quote, attrs in fields:
             if not label and isinstance(attrs, dict):
                 label = attrs.get("label")
 
-            if not isinstance(label, str) or label not in SBAR_ALLOWED_LABELS:
+            if not isinstance(label, str) or label not in allowed:
                 continue
             if not isinstance(quote, str) or not quote:
                 continue
 
-            key = (label, quote)
-            if key in seen:
-                continue
-            seen.add(key)
-            items.append(SbarItem(label=label, quote=quote))
+            yield label, quote, attrs
+
 
-    return items
+def _extract_items_from_prediction(prediction: Any) -> list[SbarItem]:
+    pairs: list[tuple[str, str]] = []
+    seen: set[tuple[str, str]] = set()
+
+    for label, quote, _attrs in _iter_prediction_fields(prediction):
+        key = (label, quote)
+        if key in seen:
+            continue
+        seen.add(key)
+        pairs.append(key)
+
+    return _as_sbar_items(pairs)
+
+
+def _split_batch_items(
+    prediction: Any, group: list[SbarRecord]
+) -> list[list[SbarItem]]:
+    """
+    Route extractions from one packed call back to their source records.
+    The prompt asks for a 1-based doc_id attribute; extractions that lack a
+    usable one fall back to the first record whose text contains the quote,
+    and anything unplaceable is dropped rather than guessed.
+    """
+    per_record_pairs: list[list[tuple[str, str]]] = [[] for _ in group]
+    per_record_seen: list[set[tuple[str, str]]] = [set() for _ in group]
+
+    for label, quote, attrs in _iter_prediction_fields(prediction):
+        doc_idx: int | None = None
+        if isinstance(attrs, dict):
+            try:
+                doc_idx = int(attrs.get("doc_id")) - 1
+            except (TypeError, ValueError):
+                doc_idx = None
+        if doc_idx is not None and not 0 <= doc_idx < len(group):
+            doc_idx = None
+        if doc_idx is None:
+            for candidate_idx, record in enumerate(group):
+                if quote in record.text:
+                    doc_idx = candidate_idx
+                    break
+        if doc_idx is None:
+            continue
+
+        key = (label, quote)
+        if key in per_record_seen[doc_idx]:
+            continue
+        per_record_seen[doc_idx].add(key)
+        per_record_pairs[doc_idx].append(key)
+
+    return [_as_sbar_items(pairs) for pairs in per_record_pairs]
 
 
 def _call_extract_api(
@@ -289,6 +418,153 @@ def _call_extract_api(
         return lx.extract(text=text, **kwargs)
 
 
+def _format_extract_failure(attempt: int, max_retries: int, exc: Exception) -> str:
+    return (
+        "LangExtract SBAR call failed "
+        f"(attempt {attempt}/{max_retries}): {exc}"
+    )
+
+
+def _format_extract_exhausted(max_retries: int, error: str) -> str:
+    return (
+        "LangExtract SBAR giving empty prediction after "
+        f"{max_retries} attempts: {error}"
+    )
+
+
+def _extract_text_with_retries(
+    lx: Any,
+    text: str,
+    *,
+    extract_kwargs: dict[str, Any],
+    max_retries: int,
+    retry_delay_seconds: float,
+) -> tuple[Any | None, str | None]:
+    """Run one text through lx.extract, returning (prediction, error)."""
+    last_error: Exception | None = None
+    for attempt in range(1, max_retries + 1):
+        try:
+            return _call_extract_api(lx, text=text, **extract_kwargs), None
+        except Exception as exc:
+            last_error = exc
+            if attempt < max_retries:
+                print(_format_extract_failure(attempt, max_retries, exc))
+                if retry_delay_seconds > 0:
+                    time.sleep(retry_delay_seconds)
+
+    assert last_error is not None
+    error = f"{type(last_error).__name__}: {last_error}"
+    print(_format_extract_exhausted(max_retries, error))
+    return None, error
+
+
+async def _extract_text_with_retries_async(
+    lx: Any,
+    text: str,
+    semaphore: asyncio.Semaphore,
+    *,
+    extract_kwargs: dict[str, Any],
+    max_retries: int,
+    retry_delay_seconds: float,
+) -> tuple[Any | None, str | None]:
+    """
+    Async twin of _extract_text_with_retries: the blocking lx.extract call
+    runs on a worker thread while retry backoff yields the event loop, so a
+    call sleeping between attempts never holds up its siblings.
+    """
+    async with semaphore:
+        last_error: Exception | None = None
+        for attempt in range(1, max_retries + 1):
+            try:
+                raw_prediction = await asyncio.to_thread(
+                    _call_extract_api, lx, text=text, **extract_kwargs
+                )
+                return raw_prediction, None
+            except Exception as exc:
+                last_error = exc
+                if attempt < max_retries:
+                    print(_format_extract_failure(attempt, max_retries, exc))
+                    if retry_delay_seconds > 0:
+                        await asyncio.sleep(retry_delay_seconds)
+
+        assert last_error is not None
+        error = f"{type(last_error).__name__}: {last_error}"
+        print(_format_extract_exhausted(max_retries, error))
+        return None, error
+
+
+def _response_cache_dir() -> Path:
+    cache_root = Path(os.getenv("XDG_CACHE_HOME") or (Path.home() / ".cache"))
+    return cache_root / "handover-annotation" / "langextract"
+
+
+def _training_examples_hash(training_records: list[SbarRecord]) -> str:
+    payload = json.dumps(
+        [
+            [record.text, [list(_ITEM_KEY(item)) for item in record.items]]
+            for record in training_records
+        ]
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _response_cache_file(
+    *,
+    text: str,
+    prompt_description: str,
+    model_id: str,
+    examples_hash: str,
+    fence_output: bool | None,
+    use_schema_constraints: bool,
+) -> Path:
+    payload = json.dumps(
+        [
+            text,
+            prompt_description,
+            model_id,
+            examples_hash,
+            fence_output,
+            use_schema_constraints,
+        ]
+    )
+    key = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    return _response_cache_dir() / (key + ".json")
+
+
+def _load_cached_response(cache_file: Path) -> dict[str, Any] | None:
+    """A cached response replayed in the dict shape the parsers accept."""
+    try:
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, list):
+        return None
+    return {
+        "extractions": [
+            {
+                "extraction_class": label,
+                "extraction_text": quote,
+                "attributes": attrs,
+            }
+            for label, quote, attrs in cached
+        ]
+    }
+
+
+def _store_cached_response(cache_file: Path, raw_prediction: Any) -> None:
+    """Persist the parsed (label, quote, attributes) fields of a response."""
+    fields = [
+        [label, quote, attrs if isinstance(attrs, dict) else {}]
+        for label, quote, attrs in _iter_prediction_fields(raw_prediction)
+    ]
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(fields), encoding="utf-8")
+    except (OSError, TypeError, ValueError):
+        # Best-effort: an unserializable or unwritable response just misses.
+        pass
+
+
 def _records_from_dspy_examples(examples: list[Any]) -> list[SbarRecord]:
     records: list[SbarRecord] = []
     for ex in examples:
@@ -303,7 +579,7 @@ def _records_from_dspy_examples(examples: list[Any]) -> list[SbarRecord]:
         gold_spans = _valid_gold_spans_from_text_and_spans(text=text, raw_spans=spans)
         if not gold_spans:
             continue
-        items = _span_items_from_gold_spans(text=text, raw_spans=gold_spans)
+        items = _span_items_from_valid_spans(text, gold_spans)
         if not items:
             continue
         records.append(
@@ -411,6 +687,9 @@ def run_langextract_sbar_experiment(
     lm_max_output_tokens: int | None = None,
     max_retries: int = 1,
     retry_delay_seconds: float = 1.5,
+    concurrency: int = 1,
+    batch_size: int = 1,
+    cache_responses: bool = False,
     use_dataset_test_split: bool = False,
     dry_run: bool = False,
 ) -> dict[str, float]:
@@ -428,6 +707,10 @@ def run_langextract_sbar_experiment(
         raise ValueError("max_retries must be >= 1.")
     if retry_delay_seconds < 0:
         raise ValueError("retry_delay_seconds must be >= 0.")
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1.")
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1.")
 
     if use_dataset_test_split:
         from data.dataset import prepare_dataset_sbar_span
@@ -449,22 +732,36 @@ def run_langextract_sbar_experiment(
         training_records = training_pool[:train_count]
         held_out_records = held_out_pool[:eval_count]
     else:
-        pool = load_sbar_records(data_file, annotator_id=annotator_id)
-        if len(pool) < 2:
+        # Algorithm-R reservoir sampling over the record stream: only the
+        # train+eval sample ever lives in memory, not the whole dump.
+        rng = random.Random(seed)
+        sample_size = train_examples + eval_examples
+        reservoir: list[SbarRecord] = []
+        pool_size = 0
+        for record in iter_sbar_records(data_file, annotator_id=annotator_id):
+            pool_size += 1
+            if len(reservoir) < sample_size:
+                reservoir.append(record)
+            else:
+                j = rng.randrange(pool_size)
+                if j < sample_size:
+                    reservoir[j] = record
+        if pool_size < 2:
             raise ValueError("Not enough SBAR records found to run an experiment.")
 
-        rng = random.Random(seed)
-        rng.shuffle(pool)
+        # Reservoir membership is uniform but slot order is not; shuffle the
+        # retained sample so the train/eval split stays random.
+        rng.shuffle(reservoir)
 
-        train_count = min(train_examples, max(1, len(pool) - 1))
-        eval_count = min(eval_examples, len(pool) - train_count)
+        train_count = min(train_examples, max(1, pool_size - 1))
+        eval_count = min(eval_examples, pool_size - train_count)
         if eval_count < 1:
             raise ValueError(
                 "No held-out records left for evaluation. Reduce --train-examples."
             )
 
-        training_records = pool[:train_count]
-        held_out_records = pool[train_count : train_count + eval_count]
+        training_records = reservoir[:train_count]
+        held_out_records = reservoir[train_count : train_count + eval_count]
 
     output_path = Path(output_file)
     existing_rows = _load_existing_rows(output_file)
@@ -542,74 +839,146 @@ def run_langextract_sbar_experiment(
                 strict_non_exact=prompt_validation_strict,
             )
 
-        for idx0, record in enumerate(held_out_records[start_idx:], start=start_idx):
-            last_error: Exception | None = None
-            raw_prediction: Any | None = None
-            prediction_error: str | None = None
-
-            for attempt in range(1, max_retries + 1):
-                try:
-                    raw_prediction = _call_extract_api(
-                        lx,
-                        text=record.text,
-                        prompt_description=prompt_description,
-                        examples=few_shot_examples,
-                        model_id=model_id,
-                        api_key=api_key,
-                        fence_output=fence_output,
-                        use_schema_constraints=use_schema_constraints,
-                        prompt_validation_level=lx.prompt_validation.PromptValidationLevel.OFF,
-                        prompt_validation_strict=prompt_validation_strict,
-                        show_progress=show_progress,
-                        max_workers=max_workers,
-                        lm_timeout_seconds=lm_timeout_seconds,
-                        lm_num_threads=lm_num_threads,
-                        lm_max_output_tokens=lm_max_output_tokens,
-                    )
-                    break
-                except Exception as exc:
-                    last_error = exc
-                    if attempt < max_retries:
-                        print(
-                            "LangExtract SBAR call failed "
-                            f"(attempt {attempt}/{max_retries}): {exc}"
+        extract_kwargs: dict[str, Any] = {
+            "prompt_description": prompt_description,
+            "examples": few_shot_examples,
+            "model_id": model_id,
+            "api_key": api_key,
+            "fence_output": fence_output,
+            "use_schema_constraints": use_schema_constraints,
+            "prompt_validation_level": lx.prompt_validation.PromptValidationLevel.OFF,
+            "prompt_validation_strict": prompt_validation_strict,
+            "show_progress": show_progress,
+            "max_workers": max_workers,
+            "lm_timeout_seconds": lm_timeout_seconds,
+            "lm_num_threads": lm_num_threads,
+            "lm_max_output_tokens": lm_max_output_tokens,
+        }
+        pending_records = held_out_records[start_idx:]
+
+        # One work unit per API call: a single record normally, or a packed
+        # group of batch_size records sharing one composite prompt.
+        if batch_size > 1:
+            extract_kwargs["prompt_description"] = (
+                prompt_description + BATCH_PROMPT_SUFFIX
+            )
+            groups = [
+                pending_records[i : i + batch_size]
+                for i in range(0, len(pending_records), batch_size)
+            ]
+            call_texts = [_composite_batch_text(group) for group in groups]
+        else:
+            groups = [[record] for record in pending_records]
+            call_texts = [record.text for record in pending_records]
+
+        # Opt-in persistent response cache: eval reruns with the same text,
+        # prompt, model, and training pool replay the parsed extractions
+        # instead of paying for the call again.
+        cache_files: list[Path | None] = [None] * len(call_texts)
+        results: list[tuple[Any | None, str | None] | None] = [None] * len(
+            call_texts
+        )
+        if cache_responses:
+            examples_hash = _training_examples_hash(training_records)
+            for call_idx, call_text in enumerate(call_texts):
+                cache_file = _response_cache_file(
+                    text=call_text,
+                    prompt_description=extract_kwargs["prompt_description"],
+                    model_id=model_id,
+                    examples_hash=examples_hash,
+                    fence_output=fence_output,
+                    use_schema_constraints=use_schema_constraints,
+                )
+                cache_files[call_idx] = cache_file
+                cached = _load_cached_response(cache_file)
+                if cached is not None:
+                    results[call_idx] = (cached, None)
+
+        uncached_indices = [
+            call_idx
+            for call_idx in range(len(call_texts))
+            if results[call_idx] is None
+        ]
+        if concurrency > 1 and uncached_indices:
+            # Fan every pending call out at once; the semaphore bounds how
+            # many lx.extract calls are in flight, and gather returns results
+            # in submission order so rows stay aligned with the records.
+            async def _gather_predictions() -> list[tuple[Any | None, str | None]]:
+                semaphore = asyncio.Semaphore(concurrency)
+                return list(
+                    await asyncio.gather(
+                        *(
+                            _extract_text_with_retries_async(
+                                lx,
+                                call_texts[call_idx],
+                                semaphore,
+                                extract_kwargs=extract_kwargs,
+                                max_retries=max_retries,
+                                retry_delay_seconds=retry_delay_seconds,
+                            )
+                            for call_idx in uncached_indices
                         )
-                        if retry_delay_seconds > 0:
-                            time.sleep(retry_delay_seconds)
+                    )
+                )
 
-            if raw_prediction is None:
-                assert last_error is not None
-                prediction_error = f"{type(last_error).__name__}: {last_error}"
-                print(
-                    "LangExtract SBAR giving empty prediction after "
-                    f"{max_retries} attempts: {prediction_error}"
+            for call_idx, result in zip(
+                uncached_indices, asyncio.run(_gather_predictions())
+            ):
+                results[call_idx] = result
+                cache_file = cache_files[call_idx]
+                if cache_file is not None and result[0] is not None:
+                    _store_cached_response(cache_file, result[0])
+
+        idx0 = start_idx
+        for group_offset, group in enumerate(groups):
+            result = results[group_offset]
+            if result is None:
+                result = _extract_text_with_retries(
+                    lx,
+                    call_texts[group_offset],
+                    extract_kwargs=extract_kwargs,
+                    max_retries=max_retries,
+                    retry_delay_seconds=retry_delay_seconds,
                 )
-                pred_items = []
+                cache_file = cache_files[group_offset]
+                if cache_file is not None and result[0] is not None:
+                    _store_cached_response(cache_file, result[0])
+            raw_prediction, prediction_error = result
+
+            if raw_prediction is None:
+                per_record_items: list[list[SbarItem]] = [[] for _ in group]
+            elif len(group) == 1:
+                per_record_items = [_extract_items_from_prediction(raw_prediction)]
             else:
-                pred_items = _extract_items_from_prediction(raw_prediction)
+                per_record_items = _split_batch_items(raw_prediction, group)
 
-            metrics = iou_span_metrics(
-                text=record.text,
-                gold_spans=record.gold_spans,
-                pred_items=pred_items,
-            )
-            f1_sum += metrics["f1"]
+            for record, pred_items in zip(group, per_record_items):
+                metrics = iou_span_metrics(
+                    text=record.text,
+                    gold_spans=record.gold_spans,
+                    pred_items=pred_items,
+                )
+                f1_sum += metrics["f1"]
 
-            row = _eval_row_for_record(
-                record=record,
-                pred_items=pred_items,
-                span_metrics=metrics,
-            )
-            if prediction_error is not None:
-                row["error"] = {"prediction_error": prediction_error, "metric_error": None}
-
-            out_f.write(json.dumps(row, ensure_ascii=False))
-            out_f.write("\n")
-            out_f.flush()
-            print(
-                f"Processed {idx0 + 1}/{eval_count} records "
-                f"(score={metrics['f1']:.4f})"
-            )
+                row = _eval_row_for_record(
+                    record=record,
+                    pred_items=pred_items,
+                    span_metrics=metrics,
+                )
+                if prediction_error is not None:
+                    row["error"] = {
+                        "prediction_error": prediction_error,
+                        "metric_error": None,
+                    }
+
+                out_f.write(json.dumps(row, ensure_ascii=False))
+                out_f.write("\n")
+                out_f.flush()
+                print(
+                    f"Processed {idx0 + 1}/{eval_count} records "
+                    f"(score={metrics['f1']:.4f})"
+                )
+                idx0 += 1
 
     return {
         "num_train_examples": float(train_count),
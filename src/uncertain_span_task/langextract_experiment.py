@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import dataclasses
+import hashlib
 import json
+import os
 import random
 import time
 from pathlib import Path
@@ -325,6 +327,85 @@ def _records_from_dspy_examples(examples: list[Any]) -> list[UncertaintyRecord]:
     return records
 
 
+def _prompt_validation_cache_dir() -> Path:
+    cache_root = Path(os.getenv("XDG_CACHE_HOME") or (Path.home() / ".cache"))
+    return cache_root / "handover-annotation" / "prompt_validation"
+
+
+def _prompt_validation_cache_key(
+    training_records: list[UncertaintyRecord],
+    prompt_validation_level: str,
+    prompt_validation_strict: bool,
+) -> str:
+    payload = json.dumps(
+        {
+            "examples": [
+                {
+                    "text": record.text,
+                    "items": [[item.label, item.quote] for item in record.items],
+                }
+                for record in training_records
+            ],
+            "level": prompt_validation_level,
+            "strict": prompt_validation_strict,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _validate_prompt_alignment_cached(
+    lx: Any,
+    *,
+    training_records: list[UncertaintyRecord],
+    few_shot_examples: list[Any],
+    prompt_validation_level: str,
+    prompt_validation_strict: bool,
+) -> None:
+    """
+    Run few-shot prompt alignment validation once per unique few-shot set.
+
+    The verdict is persisted under the user cache directory so sweeps over
+    --model-id/--train-examples re-validate identical training examples only
+    once instead of re-tokenizing them on every script invocation. Failed
+    validations are never cached.
+    """
+    cache_key = _prompt_validation_cache_key(
+        training_records, prompt_validation_level, prompt_validation_strict
+    )
+    cache_path = _prompt_validation_cache_dir() / f"{cache_key}.json"
+    if cache_path.exists():
+        print(
+            "Prompt validation cache hit; skipping validation "
+            f"({cache_path.name})."
+        )
+        return
+
+    report = lx.prompt_validation.validate_prompt_alignment(
+        examples=few_shot_examples,
+        aligner=lx.resolver.WordAligner(),
+    )
+    lx.prompt_validation.handle_alignment_report(
+        report,
+        level=_parse_prompt_validation_level(lx, prompt_validation_level),
+        strict_non_exact=prompt_validation_strict,
+    )
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(
+        json.dumps(
+            {
+                "validated": True,
+                "level": prompt_validation_level,
+                "strict": prompt_validation_strict,
+                "num_examples": len(few_shot_examples),
+            }
+        ),
+        encoding="utf-8",
+    )
+
+
 def _parse_prompt_validation_level(lx: Any, level: str) -> Any:
     normalized = level.strip().lower()
     mapping = {
@@ -545,14 +626,12 @@ def run_langextract_uncertainty_experiment(
             lx, prompt_validation_level
         )
         if requested_validation_level != lx.prompt_validation.PromptValidationLevel.OFF:
-            report = lx.prompt_validation.validate_prompt_alignment(
-                examples=few_shot_examples,
-                aligner=lx.resolver.WordAligner(),
-            )
-            lx.prompt_validation.handle_alignment_report(
-                report,
-                level=requested_validation_level,
-                strict_non_exact=prompt_validation_strict,
+            _validate_prompt_alignment_cached(
+                lx,
+                training_records=training_records,
+                few_shot_examples=few_shot_examples,
+                prompt_validation_level=prompt_validation_level,
+                prompt_validation_strict=prompt_validation_strict,
             )
 
         for idx0, record in enumerate(held_out_records[start_idx:], start=start_idx):
@@ -0,0 +1,12 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch):
+    """
+    Point every on-disk cache (dataset pickles, langextract responses) at a
+    per-test directory so the suite never writes into the developer's real
+    ~/.cache. Tests that care about caching behaviour set their own
+    XDG_CACHE_HOME on top of this.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
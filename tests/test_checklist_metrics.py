@@ -0,0 +1,67 @@
+import pytest
+
+from checklist_task.labels import LABEL_BITS, pack_labels
+from checklist_task.metric_gepa import multilabel_f1_with_feedback
+from checklist_task.metric_miprov import multilabel_f1
+
+
+def test_pack_labels_is_bitwise_set_semantics():
+    assert pack_labels(None) == 0
+    assert pack_labels([]) == 0
+    assert pack_labels(["sit_diagnosis"]) == LABEL_BITS["sit_diagnosis"]
+    # Duplicates collapse exactly like a set would.
+    assert pack_labels(["sit_diagnosis", "sit_diagnosis"]) == pack_labels(
+        ["sit_diagnosis"]
+    )
+
+
+def test_pack_labels_assigns_bits_to_unknown_labels():
+    first = pack_labels(["made_up_label"])
+    second = pack_labels(["made_up_label"])
+    assert first == second
+    assert first not in (0, pack_labels(["sit_diagnosis"]))
+    # The module table stays immutable; unknown labels live in the shared
+    # per-comparison table instead.
+    assert "made_up_label" not in LABEL_BITS
+
+
+def test_pack_labels_distinguishes_unknown_labels_within_a_comparison():
+    oov_bits: dict[str, int] = {}
+    gold = pack_labels(["oov_a"], oov_bits)
+    got = pack_labels(["oov_b"], oov_bits)
+    assert gold != got
+    # Two different hallucinated labels must not alias to the same bit.
+    assert multilabel_f1({"labels": ["oov_a"]}, {"labels": ["oov_b"]}) == 0.0
+    assert multilabel_f1({"labels": ["oov_a"]}, {"labels": ["oov_a"]}) == 1.0
+
+
+def test_multilabel_f1_matches_set_arithmetic():
+    example = {"labels": ["sit_diagnosis", "bg_history", "assess_obs"]}
+    pred = {"labels": ["sit_diagnosis", "bg_history", "rec_plan"]}
+    # tp=2, fp=1, fn=1 -> p=r=2/3 -> f1=2/3
+    assert multilabel_f1(example, pred) == pytest.approx(2 / 3)
+
+
+def test_multilabel_f1_counts_hallucinated_labels_as_false_positives():
+    example = {"labels": ["sit_diagnosis"]}
+    pred = {"labels": ["sit_diagnosis", "not_a_real_label"]}
+    # tp=1, fp=1, fn=0 -> p=0.5, r=1 -> f1=2/3
+    assert multilabel_f1(example, pred) == pytest.approx(2 / 3)
+
+
+def test_multilabel_f1_empty_cases():
+    assert multilabel_f1({"labels": []}, {"labels": []}) == 1.0
+    assert multilabel_f1({"labels": ["sit_diagnosis"]}, {"labels": []}) == 0.0
+    assert multilabel_f1({"labels": []}, {"labels": ["sit_diagnosis"]}) == 0.0
+
+
+def test_multilabel_f1_with_feedback_scoring_and_feedback_modes():
+    example = {"labels": ["sit_diagnosis", "bg_history"]}
+    pred = {"labels": ["sit_diagnosis"]}
+
+    score = multilabel_f1_with_feedback(example, pred)
+    assert score == pytest.approx(2 / 3)
+
+    result = multilabel_f1_with_feedback(example, pred, pred_name="classifier")
+    assert result.score == pytest.approx(2 / 3)
+    assert "bg_history" in result.feedback
@@ -0,0 +1,95 @@
+import pickle
+
+import srsly
+
+from data.dataset import (
+    _dataset_cache_dir,
+    build_all_variants,
+    prepare_dataset,
+    prepare_dataset_sbar_span,
+    prepare_dataset_uncertainty_binary_span,
+    prepare_dataset_uncertainty_span,
+)
+
+
+def _write_jsonl(tmp_path, rows):
+    jsonl_path = tmp_path / "data.jsonl"
+    srsly.write_jsonl(jsonl_path, rows)
+    return str(jsonl_path)
+
+
+def _example_rows():
+    rows = []
+    for i in range(12):
+        spans = [{"start": 0, "end": 5, "label": "SITUATION"}]
+        if i % 3:
+            spans.append({"start": 6, "end": 11, "label": "Hedging"})
+        if i % 4 == 0:
+            spans = []
+        rows.append(
+            {
+                "text": f"alpha bravo charlie {i}",
+                "accept": ["sit_diagnosis"] if i % 2 else [],
+                "spans": spans,
+                "_annotator_id": "handover_db-user1",
+            }
+        )
+    return rows
+
+
+def _keys(examples):
+    return [ex.text for ex in examples]
+
+
+def test_build_all_variants_matches_per_task_loaders(tmp_path):
+    jsonl_path = _write_jsonl(tmp_path, _example_rows())
+
+    variants = build_all_variants(jsonl_path)
+
+    expected = {
+        "checklist": prepare_dataset(jsonl_path),
+        "sbar_span": prepare_dataset_sbar_span(jsonl_path),
+        "uncertainty_span": prepare_dataset_uncertainty_span(jsonl_path),
+        "uncertainty_binary_span": prepare_dataset_uncertainty_binary_span(
+            jsonl_path
+        ),
+    }
+
+    assert set(variants) == set(expected)
+    for name, (train, test) in expected.items():
+        got_train, got_test = variants[name]
+        assert _keys(got_train) == _keys(train)
+        assert _keys(got_test) == _keys(test)
+
+
+def test_loader_results_are_pickle_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    jsonl_path = _write_jsonl(tmp_path, _example_rows())
+
+    first = prepare_dataset(jsonl_path)
+    cache_files = list(_dataset_cache_dir().glob("*.pkl"))
+    assert len(cache_files) == 1
+
+    # Overwrite the cached payload; an unchanged source must serve it back.
+    sentinel = (["train-sentinel"], ["test-sentinel"])
+    cache_files[0].write_bytes(pickle.dumps(sentinel))
+    assert prepare_dataset(jsonl_path) == sentinel
+    assert first != sentinel
+
+
+def test_dataset_cache_env_kill_switch_skips_pickles(tmp_path, monkeypatch):
+    monkeypatch.setenv("HANDOVER_DATASET_CACHE", "0")
+    jsonl_path = _write_jsonl(tmp_path, _example_rows())
+
+    prepare_dataset(jsonl_path)
+
+    assert not list(_dataset_cache_dir().glob("*.pkl"))
+
+
+def test_build_all_variants_collapses_binary_labels(tmp_path):
+    jsonl_path = _write_jsonl(tmp_path, _example_rows())
+
+    train, test = build_all_variants(jsonl_path)["uncertainty_binary_span"]
+
+    for ex in [*train, *test]:
+        assert {span["label"] for span in ex["gold_spans"]} == {"UNCERTAIN"}
@@ -0,0 +1,80 @@
+import srsly
+
+from data.dataset import (
+    _arrow_cache_path,
+    prepare_dataset_sbar_span,
+    prepare_dataset_sbar_span_all,
+    prepare_dataset_sbar_span_arrow,
+    prepare_dataset_sbar_span_arrow_all,
+)
+
+
+def _write_jsonl(tmp_path, rows):
+    jsonl_path = tmp_path / "data.jsonl"
+    srsly.write_jsonl(jsonl_path, rows)
+    return str(jsonl_path)
+
+
+def _example_rows():
+    return [
+        {
+            "text": f"alpha bravo charlie {i}",
+            "spans": [
+                {"start": 0, "end": 5, "label": "SITUATION"},
+                {"start": 6, "end": 11, "label": "OTHER"},  # filtered out
+            ],
+            "_annotator_id": "handover_db-user1" if i % 2 else "handover_db-user2",
+        }
+        for i in range(8)
+    ]
+
+
+def _as_tuples(examples):
+    return [
+        (ex.text, [(s["start"], s["end"], s["label"]) for s in ex["gold_spans"]])
+        for ex in examples
+    ]
+
+
+def test_arrow_loader_matches_jsonl_loader(tmp_path):
+    jsonl_path = _write_jsonl(tmp_path, _example_rows())
+
+    train_jsonl, test_jsonl = prepare_dataset_sbar_span(jsonl_path)
+    train_arrow, test_arrow = prepare_dataset_sbar_span_arrow(jsonl_path)
+
+    assert _as_tuples(train_arrow) == _as_tuples(train_jsonl)
+    assert _as_tuples(test_arrow) == _as_tuples(test_jsonl)
+    assert _arrow_cache_path(jsonl_path).exists()
+
+
+def test_arrow_loader_filters_annotator(tmp_path):
+    jsonl_path = _write_jsonl(tmp_path, _example_rows())
+
+    expected = prepare_dataset_sbar_span_all(
+        jsonl_path, annotator_id="handover_db-user1"
+    )
+    actual = prepare_dataset_sbar_span_arrow_all(
+        jsonl_path, annotator_id="handover_db-user1"
+    )
+
+    assert _as_tuples(actual) == _as_tuples(expected)
+    assert len(actual) == 4
+
+
+def test_arrow_cache_rebuilt_when_jsonl_changes(tmp_path):
+    rows = _example_rows()
+    jsonl_path = _write_jsonl(tmp_path, rows)
+
+    prepare_dataset_sbar_span_arrow_all(jsonl_path)
+    cache_path = _arrow_cache_path(jsonl_path)
+    assert cache_path.exists()
+
+    # Rewrite the JSONL with fewer rows and bump its mtime past the cache.
+    srsly.write_jsonl(jsonl_path, rows[:2])
+    import os
+
+    stale = cache_path.stat().st_mtime
+    os.utime(jsonl_path, (stale + 10, stale + 10))
+
+    refreshed = prepare_dataset_sbar_span_arrow_all(jsonl_path)
+    assert len(refreshed) == 2
@@ -0,0 +1,131 @@
+import json
+
+import dspy
+import pytest
+
+from eval.evaluator import evaluate_sbar, predict_with_retries, timing_sidecar_path
+
+
+class _PerfectSbarPredictor:
+    """Returns predictions that exactly match each example's gold spans."""
+
+    def __call__(self, *, text: str) -> dspy.Prediction:
+        return dspy.Prediction(
+            pred_spans=[{"label": "SITUATION", "quote": text[:5]}]
+        )
+
+
+def _make_testset(count: int) -> list[dspy.Example]:
+    return [
+        dspy.Example(
+            text=f"alpha bravo charlie {i}",
+            gold_spans=[{"start": 0, "end": 5, "label": "SITUATION"}],
+        ).with_inputs("text")
+        for i in range(count)
+    ]
+
+
+def test_evaluate_sbar_writes_rows_and_scores(tmp_path):
+    out_file = tmp_path / "eval.jsonl"
+    testset = _make_testset(3)
+
+    score = evaluate_sbar(_PerfectSbarPredictor(), testset, str(out_file))
+
+    assert score == pytest.approx(100.0)
+    rows = [json.loads(line) for line in out_file.read_text().splitlines()]
+    assert len(rows) == 3
+    for row in rows:
+        assert row["score"] == pytest.approx(1.0)
+        assert "error" not in row
+
+
+def test_evaluate_sbar_resume_skips_completed_examples(tmp_path):
+    out_file = tmp_path / "eval.jsonl"
+    testset = _make_testset(2)
+
+    evaluate_sbar(_PerfectSbarPredictor(), testset, str(out_file))
+    first_contents = out_file.read_text()
+
+    # Second run resumes from a complete file and must not re-run anything.
+    class _ExplodingPredictor:
+        def __call__(self, **inputs):
+            raise AssertionError("resume should not call the predictor")
+
+    score = evaluate_sbar(
+        _ExplodingPredictor(), testset, str(out_file), retry_delay_seconds=0.0
+    )
+    assert score == pytest.approx(100.0)
+    assert out_file.read_text() == first_contents
+
+
+def test_evaluate_sbar_timing_logs_write_ndjson_sidecar(tmp_path, capsys):
+    out_file = tmp_path / "eval.jsonl"
+    testset = _make_testset(2)
+
+    evaluate_sbar(
+        _PerfectSbarPredictor(), testset, str(out_file), timing_logs=True
+    )
+
+    sidecar = timing_sidecar_path(str(out_file))
+    assert sidecar.exists()
+    timing_rows = [json.loads(line) for line in sidecar.read_text().splitlines()]
+    assert len(timing_rows) == 2
+    for row in timing_rows:
+        assert "idx" in row
+        assert "total_seconds" in row
+        assert "prediction_seconds" in row
+
+    captured = capsys.readouterr().out
+    assert "[timing-summary]" in captured
+    assert "slowest examples" in captured
+
+
+def test_evaluate_sbar_validation_rejects_broken_examples_before_predicting(
+    tmp_path,
+):
+    out_file = tmp_path / "eval.jsonl"
+    # No with_inputs() call, so inputs() raises during the pre-flight sweep.
+    testset = [
+        dspy.Example(
+            text="alpha bravo",
+            gold_spans=[{"start": 0, "end": 5, "label": "SITUATION"}],
+        )
+    ]
+
+    class _ExplodingPredictor:
+        def __call__(self, **inputs):
+            raise AssertionError("validation should fail before any prediction")
+
+    with pytest.raises(ValueError, match="failed validation"):
+        evaluate_sbar(_ExplodingPredictor(), testset, str(out_file))
+    assert not out_file.exists()
+
+
+def test_predict_with_retries_recovers_from_transient_errors():
+    class _FlakyPredictor:
+        def __init__(self):
+            self.calls = 0
+
+        def __call__(self, *, text: str) -> dspy.Prediction:
+            self.calls += 1
+            if self.calls < 2:
+                raise RuntimeError("transient")
+            return dspy.Prediction(pred_spans=[])
+
+    predictor = _FlakyPredictor()
+    pred = predict_with_retries(
+        predictor, {"text": "abc"}, max_retries=3, retry_delay_seconds=0.0
+    )
+    assert predictor.calls == 2
+    assert pred.pred_spans == []
+
+
+def test_predict_with_retries_raises_after_exhausting_attempts():
+    class _AlwaysFailing:
+        def __call__(self, **inputs):
+            raise RuntimeError("permanent")
+
+    with pytest.raises(RuntimeError, match="failed after 2 attempts"):
+        predict_with_retries(
+            _AlwaysFailing(), {"text": "abc"}, max_retries=2, retry_delay_seconds=0.0
+        )
@@ -1,6 +1,7 @@
 import srsly
 
 from sbar_span_task.langextract_experiment import (
+    _extract_items_from_prediction,
     exact_match_metrics,
     iou_span_metrics,
     load_sbar_records,
@@ -32,6 +33,35 @@ def test_span_items_from_record_filters_invalid_and_disallowed_spans():
     ]
 
 
+def test_extraction_parsing_handles_mixed_and_generator_containers():
+    class _Extraction:
+        def __init__(self, label, quote):
+            self.extraction_class = label
+            self.extraction_text = quote
+            self.attributes = {}
+
+    mixed = {
+        "extractions": [
+            _Extraction("SITUATION", "alpha"),
+            {"extraction_class": "BACKGROUND", "extraction_text": "bravo"},
+        ]
+    }
+    assert [(i.label, i.quote) for i in _extract_items_from_prediction(mixed)] == [
+        ("SITUATION", "alpha"),
+        ("BACKGROUND", "bravo"),
+    ]
+
+    generated = {
+        "extractions": (
+            {"extraction_class": "ASSESSMENT", "extraction_text": quote}
+            for quote in ["charlie"]
+        )
+    }
+    assert [
+        (i.label, i.quote) for i in _extract_items_from_prediction(generated)
+    ] == [("ASSESSMENT", "charlie")]
+
+
 def test_exact_match_metrics_returns_expected_values():
     gold = [
         {"label": "SITUATION", "quote": "A"},
@@ -92,6 +122,36 @@ def test_load_sbar_records_respects_annotator_filter(tmp_path):
     assert len(all_records) == 2
 
 
+def test_random_split_sampling_is_deterministic_per_seed(tmp_path):
+    rows = [
+        {
+            "text": f"seeded_sample_{i}",
+            "spans": [{"start": 0, "end": 6, "label": "SITUATION"}],
+        }
+        for i in range(50)
+    ]
+    data_file = tmp_path / "data_seeded.jsonl"
+    srsly.write_jsonl(data_file, rows)
+
+    texts = []
+    for run in range(2):
+        output_file = tmp_path / f"out_seeded_{run}.jsonl"
+        run_langextract_sbar_experiment(
+            data_file=str(data_file),
+            output_file=str(output_file),
+            model_id="gpt-5.2",
+            train_examples=5,
+            eval_examples=4,
+            seed=7,
+            dry_run=True,
+        )
+        out_rows = list(srsly.read_jsonl(output_file))
+        texts.append([row["example"]["text"] for row in out_rows])
+
+    assert len(texts[0]) == 4
+    assert texts[0] == texts[1]
+
+
 def test_use_dataset_test_split_matches_prepare_dataset_test_split(tmp_path):
     from data.dataset import prepare_dataset_sbar_span
 
@@ -134,6 +194,169 @@ def test_use_dataset_test_split_matches_prepare_dataset_test_split(tmp_path):
     assert out_texts == expected_test_texts
 
 
+def test_concurrent_extraction_preserves_record_order(tmp_path, monkeypatch):
+    from sbar_span_task import langextract_experiment
+
+    rows = []
+    for i in range(20):
+        text = f"concurrent_sample_{i}"
+        rows.append(
+            {
+                "text": text,
+                "spans": [{"start": 0, "end": len(text), "label": "SITUATION"}],
+            }
+        )
+
+    data_file = tmp_path / "data_concurrent.jsonl"
+    output_file = tmp_path / "out_concurrent.jsonl"
+    srsly.write_jsonl(data_file, rows)
+
+    def fake_extract(lx, *, text, **kwargs):
+        return {
+            "extractions": [
+                {"extraction_class": "SITUATION", "extraction_text": text}
+            ]
+        }
+
+    monkeypatch.setattr(langextract_experiment, "_call_extract_api", fake_extract)
+
+    summary = run_langextract_sbar_experiment(
+        data_file=str(data_file),
+        output_file=str(output_file),
+        model_id="gpt-5.2",
+        train_examples=3,
+        eval_examples=4,
+        prompt_validation_level="off",
+        show_progress=False,
+        concurrency=4,
+        use_dataset_test_split=True,
+    )
+
+    from data.dataset import prepare_dataset_sbar_span
+
+    _, testset = prepare_dataset_sbar_span(str(data_file))
+    expected_test_texts = [ex.text for ex in testset][:4]
+
+    out_rows = list(srsly.read_jsonl(output_file))
+    assert [row["example"]["text"] for row in out_rows] == expected_test_texts
+    # Predictions echo the gold span exactly, so every row scores 1.0 and
+    # rows land in testset order despite the concurrent fan-out.
+    for row in out_rows:
+        assert row["score"] == 1.0
+    assert int(summary["num_eval_examples"]) == 4
+    assert summary["average_f1"] == 1.0
+
+
+def test_batched_prompting_routes_extractions_back_to_records(tmp_path, monkeypatch):
+    from sbar_span_task import langextract_experiment
+
+    rows = []
+    for i in range(20):
+        text = f"packed_sample_{i}"
+        rows.append(
+            {
+                "text": text,
+                "spans": [{"start": 0, "end": len(text), "label": "SITUATION"}],
+            }
+        )
+
+    data_file = tmp_path / "data_packed.jsonl"
+    output_file = tmp_path / "out_packed.jsonl"
+    srsly.write_jsonl(data_file, rows)
+
+    calls: list[str] = []
+
+    def fake_extract(lx, *, text, **kwargs):
+        calls.append(text)
+        # One extraction per packed document, tagged with its marker id.
+        extractions = []
+        for chunk in text.split("=== DOC ")[1:]:
+            doc_id, doc_text = chunk.split(" ===\n", 1)
+            extractions.append(
+                {
+                    "extraction_class": "SITUATION",
+                    "extraction_text": doc_text.split("\n\n")[0],
+                    "attributes": {"doc_id": doc_id},
+                }
+            )
+        return {"extractions": extractions}
+
+    monkeypatch.setattr(langextract_experiment, "_call_extract_api", fake_extract)
+
+    summary = run_langextract_sbar_experiment(
+        data_file=str(data_file),
+        output_file=str(output_file),
+        model_id="gpt-5.2",
+        train_examples=3,
+        eval_examples=4,
+        prompt_validation_level="off",
+        show_progress=False,
+        batch_size=2,
+        use_dataset_test_split=True,
+    )
+
+    assert len(calls) == 2  # 4 records packed two per call
+    out_rows = list(srsly.read_jsonl(output_file))
+    assert len(out_rows) == 4
+    for row in out_rows:
+        assert row["score"] == 1.0
+    assert summary["average_f1"] == 1.0
+
+
+def test_cached_responses_skip_repeat_extraction_calls(tmp_path, monkeypatch):
+    from sbar_span_task import langextract_experiment
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    rows = []
+    for i in range(20):
+        text = f"cached_sample_{i}"
+        rows.append(
+            {
+                "text": text,
+                "spans": [{"start": 0, "end": len(text), "label": "SITUATION"}],
+            }
+        )
+
+    data_file = tmp_path / "data_cached.jsonl"
+    srsly.write_jsonl(data_file, rows)
+
+    calls: list[str] = []
+
+    def fake_extract(lx, *, text, **kwargs):
+        calls.append(text)
+        return {
+            "extractions": [
+                {"extraction_class": "SITUATION", "extraction_text": text}
+            ]
+        }
+
+    monkeypatch.setattr(langextract_experiment, "_call_extract_api", fake_extract)
+
+    summaries = []
+    for run in range(2):
+        output_file = tmp_path / f"out_cached_{run}.jsonl"
+        summaries.append(
+            run_langextract_sbar_experiment(
+                data_file=str(data_file),
+                output_file=str(output_file),
+                model_id="gpt-5.2",
+                train_examples=3,
+                eval_examples=4,
+                prompt_validation_level="off",
+                show_progress=False,
+                cache_responses=True,
+                use_dataset_test_split=True,
+            )
+        )
+
+    # First run pays for every record; the rerun replays from the cache.
+    eval_count = int(summaries[0]["num_eval_examples"])
+    assert eval_count > 0
+    assert len(calls) == eval_count
+    assert summaries[0] == summaries[1]
+    assert summaries[1]["average_f1"] == 1.0
+
+
 def test_langextract_sbar_resume_from_existing_partial_jsonl(tmp_path):
     from data.dataset import prepare_dataset_sbar_span
 